@@ -6,11 +6,6 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
-from src.utils.pkd_mapping import get_all_divisions
-from src.services.data_service import DataService
-from src.services.analysis_service import AnalysisService
-from src.services.export_service import ExportService
-from src.visualization.charts import Visualizer
 from src.utils.exceptions import IndeksBranzError
 
 
@@ -34,6 +29,11 @@ def run_analysis(logger) -> dict:
     
     logger.info("[3/7] Wybór sektorów do analizy...")
     from src.data_collection.database_loader import DatabaseLoader
+    from src.services.data_service import DataService
+    from src.services.analysis_service import AnalysisService
+    from src.services.export_service import ExportService
+    from src.visualization.charts import Visualizer
+    
     loader = DatabaseLoader()
     available_pkd = loader.get_available_pkd_codes()
     
@@ -77,21 +77,15 @@ def run_analysis(logger) -> dict:
     logger.info("[7/7] Tworzenie wizualizacji...")
     visualizer = Visualizer(config)
     
-    fig_ranking = visualizer.create_index_ranking(results_df, top_n=20)
-    visualizer.save_figure(fig_ranking, 'ranking_indeksu', 'html')
-    
-    fig_growth = visualizer.create_growth_comparison(results_df, top_n=15)
-    visualizer.save_figure(fig_growth, 'porownanie_wzrostu', 'html')
-    
-    fig_categories = visualizer.create_category_distribution(results_df)
-    visualizer.save_figure(fig_categories, 'rozkład_kategorii', 'html')
-    
-    fig_corr = visualizer.create_correlation_heatmap(results_df)
-    visualizer.save_figure(fig_corr, 'korelacja_wskaźników', 'html')
-    
+    figures = {
+        'ranking_indeksu': visualizer.create_index_ranking(results_df, top_n=20),
+        'porownanie_wzrostu': visualizer.create_growth_comparison(results_df, top_n=15),
+        'rozkład_kategorii': visualizer.create_category_distribution(results_df),
+        'korelacja_wskaźników': visualizer.create_correlation_heatmap(results_df),
+    }
     for pkd_code in results_df.head(3)['pkd_code']:
-        fig_radar = visualizer.create_radar_chart(results_df, pkd_code)
-        visualizer.save_figure(fig_radar, f'radar_{pkd_code}', 'html')
+        figures[f'radar_{pkd_code}'] = visualizer.create_radar_chart(results_df, pkd_code)
+    visualizer.save_all(figures, 'html')
     
     logger.info("=" * 60)
     logger.info("PODSUMOWANIE")
@@ -107,6 +101,7 @@ def run_analysis(logger) -> dict:
         )
     
     category_counts = results_df['category'].value_counts()
+    category_counts = category_counts[category_counts > 0]
     logger.info("\nRozkład kategorii:")
     for category, count in category_counts.items():
         logger.info(f"  {category}: {count}")
@@ -123,13 +118,18 @@ def run_analysis(logger) -> dict:
     return export_paths
 
 
-def run_api_server(logger, host: str = "0.0.0.0", port: int = 8000, reload: bool = True):
+def run_api_server(logger, host: str = "0.0.0.0", port: int = 8000, reload: bool = True, workers: int = 1):
     try:
         import uvicorn
         
+        if workers > 1 and reload:
+            logger.warning("Auto-reload nie działa z wieloma procesami roboczymi - wyłączam auto-reload")
+            reload = False
+        
         logger.info("=" * 60)
         logger.info("Uruchamianie serwera FastAPI...")
         logger.info(f"Serwer będzie dostępny pod adresem: http://{host}:{port}")
+        logger.info(f"Liczba procesów roboczych: {workers}")
         logger.info(f"Swagger UI: http://{host}:{port}/docs")
         logger.info(f"ReDoc: http://{host}:{port}/redoc")
         logger.info("=" * 60)
@@ -141,6 +141,7 @@ def run_api_server(logger, host: str = "0.0.0.0", port: int = 8000, reload: bool
             host=host,
             port=port,
             reload=reload,
+            workers=workers,
             log_level="info"
         )
     except ImportError:
@@ -163,6 +164,7 @@ Przykłady:
   python main.py --mode api
   python main.py --mode both
   python main.py --mode api --port 8080
+  python main.py --mode api --workers 4
         """
     )
     
@@ -193,6 +195,13 @@ Przykłady:
         help="Wyłącz auto-reload dla serwera API"
     )
     
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Liczba procesów roboczych serwera API (domyślnie: 1, więcej wyłącza auto-reload)"
+    )
+    
     args = parser.parse_args()
     
     log_file = Path("logs") / "indeks_branz.log"
@@ -210,7 +219,8 @@ Przykłady:
                 logger,
                 host=args.host,
                 port=args.port,
-                reload=not args.no_reload
+                reload=not args.no_reload,
+                workers=args.workers
             )
         
     except IndeksBranzError as e:
@@ -5,10 +5,6 @@ sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from src.utils.config_loader import load_config
 from src.utils.logger import setup_logger
-from src.services.data_service import DataService
-from src.services.analysis_service import AnalysisService
-from src.services.export_service import ExportService
-from src.visualization.charts import Visualizer
 from src.utils.exceptions import IndeksBranzError
 
 def run_analysis(logger):
@@ -31,6 +27,11 @@ def run_analysis(logger):
     
     logger.info("[3/7] Wybór sektorów do analizy...")
     from src.data_collection.database_loader import DatabaseLoader
+    from src.services.data_service import DataService
+    from src.services.analysis_service import AnalysisService
+    from src.services.export_service import ExportService
+    from src.visualization.charts import Visualizer
+    
     loader = DatabaseLoader()
     available_pkd = loader.get_available_pkd_codes()
     
@@ -74,21 +75,15 @@ def run_analysis(logger):
     logger.info("[7/7] Tworzenie wizualizacji...")
     visualizer = Visualizer(config)
     
-    fig_ranking = visualizer.create_index_ranking(results_df, top_n=20)
-    visualizer.save_figure(fig_ranking, 'ranking_indeksu', 'html')
-    
-    fig_growth = visualizer.create_growth_comparison(results_df, top_n=15)
-    visualizer.save_figure(fig_growth, 'porownanie_wzrostu', 'html')
-    
-    fig_categories = visualizer.create_category_distribution(results_df)
-    visualizer.save_figure(fig_categories, 'rozkład_kategorii', 'html')
-    
-    fig_corr = visualizer.create_correlation_heatmap(results_df)
-    visualizer.save_figure(fig_corr, 'korelacja_wskaźników', 'html')
-    
+    figures = {
+        'ranking_indeksu': visualizer.create_index_ranking(results_df, top_n=20),
+        'porownanie_wzrostu': visualizer.create_growth_comparison(results_df, top_n=15),
+        'rozkład_kategorii': visualizer.create_category_distribution(results_df),
+        'korelacja_wskaźników': visualizer.create_correlation_heatmap(results_df),
+    }
     for pkd_code in results_df.head(3)['pkd_code']:
-        fig_radar = visualizer.create_radar_chart(results_df, pkd_code)
-        visualizer.save_figure(fig_radar, f'radar_{pkd_code}', 'html')
+        figures[f'radar_{pkd_code}'] = visualizer.create_radar_chart(results_df, pkd_code)
+    visualizer.save_all(figures, 'html')
     
     logger.info("=" * 60)
     logger.info("Analiza zakończona pomyślnie!")
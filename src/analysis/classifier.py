@@ -1,4 +1,5 @@
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 
 from src.models.config import Config
@@ -11,29 +12,49 @@ class SectorClassifier:
     def __init__(self, config: Config):
         self.config = config
         self.categories = config.classification.categories
+        
+        ascending = sorted(self.categories, key=lambda x: x.min_score, reverse=True)[::-1]
+        self._thresholds = np.array([category.min_score for category in ascending], dtype=np.float64)
+        names = ["Bardzo słaba kondycja"] + [category.name for category in ascending]
+        self.category_dtype = pd.CategoricalDtype(categories=list(dict.fromkeys(names)), ordered=True)
+        self._codes = self.category_dtype.categories.get_indexer(names).astype(np.int8)
         logger.debug("SectorClassifier initialized")
     
     def classify_sectors(self, indicators_df: pd.DataFrame) -> pd.DataFrame:
-        df = indicators_df.copy()
-        
-        def assign_category(score: float) -> str:
-            for category in sorted(self.categories, key=lambda x: x.min_score, reverse=True):
-                if score >= category.min_score:
-                    return category.name
-            return "Bardzo słaba kondycja"
+        df = indicators_df.copy(deep=False)
         
-        df['category'] = df['final_index'].apply(assign_category)
+        scores = df['final_index'].to_numpy(dtype=np.float64)
+        positions = np.searchsorted(self._thresholds, scores, side='right')
+        positions[np.isnan(scores)] = 0
+        df['category'] = pd.Categorical.from_codes(self._codes[positions], dtype=self.category_dtype)
         
         return df
     
     def get_top_sectors(self, indicators_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
-        return indicators_df.nlargest(n, 'final_index')
+        return self._select_extreme(indicators_df, 'final_index', n, largest=True)
     
     def get_bottom_sectors(self, indicators_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
-        return indicators_df.nsmallest(n, 'final_index')
+        return self._select_extreme(indicators_df, 'final_index', n, largest=False)
     
     def get_growing_sectors(self, indicators_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
-        return indicators_df.nlargest(n, 'growth_score')
+        return self._select_extreme(indicators_df, 'growth_score', n, largest=True)
     
     def get_risky_sectors(self, indicators_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
-        return indicators_df.nsmallest(n, 'risk_score')
+        return self._select_extreme(indicators_df, 'risk_score', n, largest=False)
+    
+    @staticmethod
+    def _select_extreme(indicators_df: pd.DataFrame, column: str, n: int, largest: bool) -> pd.DataFrame:
+        values = indicators_df[column].to_numpy(dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(values))
+        n = min(n, len(valid))
+        if n <= 0:
+            return indicators_df.iloc[:0]
+        
+        keys = -values[valid] if largest else values[valid]
+        kth = np.partition(keys, n - 1)[n - 1]
+        below = np.flatnonzero(keys < kth)
+        at_kth = np.flatnonzero(keys == kth)[:n - len(below)]
+        chosen = np.sort(np.concatenate([below, at_kth]))
+        
+        order = chosen[np.argsort(keys[chosen], kind='stable')]
+        return indicators_df.iloc[valid[order]]
@@ -8,144 +8,122 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+def _compute_scores(
+    revenue: np.ndarray,
+    profit: np.ndarray,
+    assets: np.ndarray,
+    debt: np.ndarray,
+    bankruptcies: np.ndarray,
+    num_companies: np.ndarray,
+    prev_revenue: np.ndarray,
+    prev_profit: np.ndarray,
+    prev_assets: np.ndarray,
+    has_last: np.ndarray,
+    has_prev: np.ndarray,
+    weights: np.ndarray,
+) -> Dict[str, np.ndarray]:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        revenue_growth = np.where(has_prev & (prev_revenue != 0), (revenue - prev_revenue) / prev_revenue, 0.0)
+        profit_growth = np.where(has_prev & (prev_profit != 0), (profit - prev_profit) / prev_profit, 0.0)
+        assets_growth = np.where(has_prev & (prev_assets != 0), (assets - prev_assets) / prev_assets, 0.0)
+        
+        profit_margin = np.where(revenue > 0, profit / revenue, 0.0)
+        debt_to_assets = np.where(assets > 0, debt / assets, 0.0)
+        bankruptcy_rate = np.where(num_companies > 0, bankruptcies / num_companies, 0.0)
+    
+    size_metric = (revenue / 10000000 + assets / 20000000 + num_companies / 10000) / 3
+    size_score = np.nan_to_num(np.clip(size_metric, 0.0, 1.0), nan=0.0)
+    
+    avg_growth = (revenue_growth + profit_growth + assets_growth) / 3
+    growth_score = np.where(has_prev, np.clip((avg_growth + 0.1) / 0.3, 0.0, 1.0), 0.5)
+    
+    profitability_score = np.clip(profit_margin * 10, 0.0, 1.0)
+    debt_score = np.where(has_last, np.clip(1 - debt_to_assets, 0.0, 1.0), 0.5)
+    risk_score = np.where(has_last, np.clip(1 - bankruptcy_rate * 10, 0.0, 1.0), 0.5)
+    
+    final_index = np.column_stack([
+        size_score, growth_score, profitability_score, debt_score, risk_score
+    ]) @ weights
+    
+    return {
+        'size_score': size_score,
+        'growth_score': growth_score,
+        'profitability_score': profitability_score,
+        'debt_score': debt_score,
+        'risk_score': risk_score,
+        'final_index': final_index,
+        'revenue_growth_yoy': revenue_growth,
+        'profit_growth_yoy': profit_growth,
+        'profit_margin': profit_margin,
+        'debt_to_assets': debt_to_assets,
+        'bankruptcy_rate': bankruptcy_rate,
+    }
+
+
 class IndicatorCalculator:
     def __init__(self, config: Config):
         self.config = config
         self.weights = config.weights
+        self._weight_vector = self.weights.as_array()
         logger.debug("IndicatorCalculator initialized")
     
     def calculate_all_indicators(self, sector_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        results = []
-        
-        for pkd_code, data in sector_data.items():
-            try:
-                logger.debug(f"Calculating indicators for sector {pkd_code}")
-                indicators = self.calculate_sector_indicators(pkd_code, data)
-                results.append(indicators)
-            except Exception as e:
-                logger.error(f"Error calculating indicators for sector {pkd_code}: {e}")
-                raise
-        
-        return pd.DataFrame(results)
+        if not sector_data:
+            return pd.DataFrame()
+        
+        pkd_codes = list(sector_data.keys())
+        logger.debug(f"Calculating indicators for {len(pkd_codes)} sectors")
+        
+        try:
+            frames = list(sector_data.values())
+            sector_idx = np.repeat(np.arange(len(frames)), [len(data) for data in frames])
+            combined = pd.concat(frames, ignore_index=True)
+            
+            years = combined['year'].to_numpy()
+            in_order = np.all((sector_idx[1:] > sector_idx[:-1]) | (years[1:] >= years[:-1]))
+            order = slice(None) if in_order else np.lexsort((years, sector_idx))
+            
+            sorted_idx = sector_idx[order]
+            sectors = np.arange(len(frames))
+            ends = np.searchsorted(sorted_idx, sectors, side='right')
+            counts = ends - np.searchsorted(sorted_idx, sectors, side='left')
+            
+            has_last = counts >= 1
+            has_prev = counts >= 2
+            last_pos = np.where(has_last, ends - 1, -1)
+            prev_pos = np.where(has_prev, ends - 2, -1)
+            
+            def column(name: str) -> np.ndarray:
+                return np.append(combined[name].to_numpy(dtype=np.float64)[order], np.nan)
+            
+            revenue = column('revenue')
+            profit = column('profit')
+            assets = column('assets')
+            
+            raw_companies = combined['num_companies'].to_numpy()[order]
+            num_companies = np.zeros(len(frames), dtype=raw_companies.dtype)
+            num_companies[has_last] = raw_companies[last_pos[has_last]]
+            
+            scores = _compute_scores(
+                revenue[last_pos],
+                profit[last_pos],
+                assets[last_pos],
+                column('debt')[last_pos],
+                column('bankruptcies')[last_pos],
+                column('num_companies')[last_pos],
+                revenue[prev_pos],
+                profit[prev_pos],
+                assets[prev_pos],
+                has_last,
+                has_prev,
+                self._weight_vector,
+            )
+            
+            columns = {'pkd_code': np.array(pkd_codes, dtype=object), **scores, 'num_companies': num_companies}
+            return pd.DataFrame(columns, copy=False)
+        except Exception as e:
+            logger.error(f"Error calculating indicators: {e}")
+            raise
     
     def calculate_sector_indicators(self, pkd_code: str, data: pd.DataFrame) -> Dict:
-        data = data.sort_values('year')
-        
-        size_score = self._calculate_size_score(data)
-        growth_score = self._calculate_growth_score(data)
-        profitability_score = self._calculate_profitability_score(data)
-        debt_score = self._calculate_debt_score(data)
-        risk_score = self._calculate_risk_score(data)
-        
-        final_index = (
-            size_score * self.weights.size +
-            growth_score * self.weights.growth +
-            profitability_score * self.weights.profitability +
-            debt_score * self.weights.debt +
-            risk_score * self.weights.risk
-        )
-        
-        return {
-            'pkd_code': pkd_code,
-            'size_score': size_score,
-            'growth_score': growth_score,
-            'profitability_score': profitability_score,
-            'debt_score': debt_score,
-            'risk_score': risk_score,
-            'final_index': final_index,
-            'revenue_growth_yoy': self._calculate_yoy_growth(data, 'revenue'),
-            'profit_growth_yoy': self._calculate_yoy_growth(data, 'profit'),
-            'profit_margin': self._calculate_profit_margin(data),
-            'debt_to_assets': self._calculate_debt_to_assets(data),
-            'bankruptcy_rate': self._calculate_bankruptcy_rate(data),
-            'num_companies': data['num_companies'].iloc[-1] if len(data) > 0 else 0
-        }
-    
-    def _calculate_size_score(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.0
-        
-        latest = data.iloc[-1]
-        
-        revenue = latest['revenue']
-        assets = latest['assets']
-        num_companies = latest['num_companies']
-        
-        size_metric = (revenue / 10000000 + assets / 20000000 + num_companies / 10000) / 3
-        return min(1.0, max(0.0, size_metric))
-    
-    def _calculate_growth_score(self, data: pd.DataFrame) -> float:
-        if len(data) < 2:
-            return 0.5
-        
-        revenue_growth = self._calculate_yoy_growth(data, 'revenue')
-        profit_growth = self._calculate_yoy_growth(data, 'profit')
-        assets_growth = self._calculate_yoy_growth(data, 'assets')
-        
-        avg_growth = (revenue_growth + profit_growth + assets_growth) / 3
-        
-        growth_score = min(1.0, max(0.0, (avg_growth + 0.1) / 0.3))
-        return growth_score
-    
-    def _calculate_profitability_score(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.0
-        
-        latest = data.iloc[-1]
-        profit_margin = latest['profit'] / latest['revenue'] if latest['revenue'] > 0 else 0
-        
-        profitability_score = min(1.0, max(0.0, profit_margin * 10))
-        return profitability_score
-    
-    def _calculate_debt_score(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.5
-        
-        latest = data.iloc[-1]
-        debt_to_assets = latest['debt'] / latest['assets'] if latest['assets'] > 0 else 0
-        
-        debt_score = max(0.0, min(1.0, 1 - debt_to_assets))
-        return debt_score
-    
-    def _calculate_risk_score(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.5
-        
-        latest = data.iloc[-1]
-        bankruptcy_rate = latest['bankruptcies'] / latest['num_companies'] if latest['num_companies'] > 0 else 0
-        
-        risk_score = max(0.0, min(1.0, 1 - bankruptcy_rate * 10))
-        return risk_score
-    
-    def _calculate_yoy_growth(self, data: pd.DataFrame, column: str) -> float:
-        if len(data) < 2:
-            return 0.0
-        
-        latest = data[column].iloc[-1]
-        previous = data[column].iloc[-2]
-        
-        if previous == 0:
-            return 0.0
-        
-        return (latest - previous) / previous
-    
-    def _calculate_profit_margin(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.0
-        
-        latest = data.iloc[-1]
-        return latest['profit'] / latest['revenue'] if latest['revenue'] > 0 else 0.0
-    
-    def _calculate_debt_to_assets(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.0
-        
-        latest = data.iloc[-1]
-        return latest['debt'] / latest['assets'] if latest['assets'] > 0 else 0.0
-    
-    def _calculate_bankruptcy_rate(self, data: pd.DataFrame) -> float:
-        if len(data) == 0:
-            return 0.0
-        
-        latest = data.iloc[-1]
-        return latest['bankruptcies'] / latest['num_companies'] if latest['num_companies'] > 0 else 0.0
+        return self.calculate_all_indicators({pkd_code: data}).iloc[0].to_dict()
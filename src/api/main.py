@@ -1,15 +1,33 @@
-from fastapi import FastAPI, HTTPException, Query
-from fastapi.responses import HTMLResponse, Response, StreamingResponse
-from typing import Optional, List
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response, StreamingResponse
+from typing import Dict, Optional, List, Literal, Tuple, get_args
+from dataclasses import dataclass, field
+import asyncio
+import hashlib
+import logging
+import time
+import numpy as np
+import orjson
 import pandas as pd
 from pathlib import Path
 import io
 from datetime import timedelta
+from email.utils import formatdate, parsedate_to_datetime
 
 from src.models.config import Config
 from src.utils.config_loader import load_config
 from src.services.data_service import DataService
 from src.services.analysis_service import AnalysisService
+from src.services.alert_service import AlertService
+from src.services.analytics_service import AnalyticsService
+from src.services.cache_service import CacheService
+from src.services.export_service import ExportService
+from src.services.integration_service import IntegrationService
+from src.services.prediction_service import PredictionService
+from src.services.realtime_service import RealtimeDataService
+from src.services.recommendation_service import RecommendationService
+from src.data_collection.database_loader import DatabaseLoader
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,6 +35,244 @@ logger = get_logger(__name__)
 config: Optional[Config] = None
 data_service: Optional[DataService] = None
 analysis_service: Optional[AnalysisService] = None
+cache_service: Optional[CacheService] = None
+database_loader: Optional[DatabaseLoader] = None
+realtime_service: Optional[RealtimeDataService] = None
+prediction_service: Optional[PredictionService] = None
+recommendation_service: Optional[RecommendationService] = None
+alert_service: Optional[AlertService] = None
+analytics_service: Optional[AnalyticsService] = None
+export_service: Optional[ExportService] = None
+integration_service: Optional[IntegrationService] = None
+
+OUTPUT_DIR = Path("data/output")
+RESULTS_CSV_PATH = OUTPUT_DIR / "indeks_branz.csv"
+RESULTS_PARQUET_PATH = OUTPUT_DIR / "indeks_branz.parquet"
+TEMPLATE_PATH = Path(__file__).parent / "templates" / "index.html"
+RESULTS_CACHE_CONTROL = "public, max-age=60"
+RESULTS_CHECK_INTERVAL = 2.0
+AVAILABLE_PKD_TTL = 3600.0
+RankingKey = Literal["final_index", "growth_score", "risk_score", "profitability_score", "size_score", "debt_score"]
+RealtimeSource = Literal["all", "gus"]
+ExportFormat = Literal["csv", "excel", "pdf"]
+RANKING_KEYS = get_args(RankingKey)
+RESULTS_MISSING_BODY = orjson.dumps({"detail": "Plik wyników nie znaleziony. Uruchom najpierw analizę."})
+
+
+@dataclass(frozen=True)
+class ResultsSnapshot:
+    version: Tuple[str, int, int]
+    df: pd.DataFrame
+    records: List[Dict]
+    rows: List[bytes]
+    index: Dict[str, int]
+    categories: Dict[str, np.ndarray]
+    rankings: Dict[str, np.ndarray]
+    search_names: np.ndarray
+    search_codes: np.ndarray
+    payloads: Dict[Tuple, bytes] = field(default_factory=dict)
+    
+    def etag(self, *params) -> str:
+        key = f"{self.version}:{params}".encode()
+        return f'"{hashlib.blake2b(key, digest_size=8).hexdigest()}"'
+    
+    @property
+    def modified_at(self) -> int:
+        return self.version[1] // 1_000_000_000
+    
+    def cache_headers(self, etag: str) -> Dict[str, str]:
+        return {
+            "ETag": etag,
+            "Last-Modified": formatdate(self.modified_at, usegmt=True),
+            "Cache-Control": RESULTS_CACHE_CONTROL,
+        }
+    
+    def json_response(self, payload: bytes, etag: str) -> Response:
+        return Response(content=payload, media_type="application/json", headers=self.cache_headers(etag))
+    
+    def records_payload(self, positions) -> bytes:
+        return b"[" + b",".join([self.rows[i] for i in positions]) + b"]"
+
+
+try:
+    INDEX_HTML = TEMPLATE_PATH.read_bytes()
+except OSError:
+    INDEX_HTML = """
+<html>
+    <head><title>Indeks Branż API</title></head>
+    <body>
+        <h1>Indeks Branż API</h1>
+        <p>Wersja 1.0.0</p>
+        <ul>
+            <li><a href="/health">/health</a> - Sprawdzenie stanu</li>
+            <li><a href="/sectors">/sectors</a> - Lista sektorów</li>
+            <li><a href="/docs">/docs</a> - Dokumentacja Swagger</li>
+        </ul>
+    </body>
+</html>
+""".encode("utf-8")
+
+
+results: Optional[ResultsSnapshot] = None
+results_checked_at: float = float("-inf")
+results_watched: bool = False
+results_watcher: Optional[asyncio.Task] = None
+available_pkd_codes: List[str] = []
+available_pkd_loaded_at: float = float("-inf")
+available_pkd_payload: Optional[Tuple[Tuple, bytes]] = None
+
+
+def _results_version() -> Optional[Tuple[str, int, int]]:
+    newest = None
+    for results_path in (RESULTS_PARQUET_PATH, RESULTS_CSV_PATH):
+        try:
+            stat = results_path.stat()
+        except FileNotFoundError:
+            continue
+        if newest is None or stat.st_mtime_ns > newest[1]:
+            newest = (str(results_path), stat.st_mtime_ns, stat.st_size)
+    return newest
+
+
+def _read_results(results_path: Path) -> pd.DataFrame:
+    if results_path.suffix == ".parquet":
+        return pd.read_parquet(results_path, engine="pyarrow")
+    
+    try:
+        return pd.read_csv(results_path, dtype={"pkd_code": str}, engine="pyarrow")
+    except ImportError:
+        logger.warning("pyarrow niedostępny, wczytuję wyniki parserem pandas")
+        return pd.read_csv(results_path, dtype={"pkd_code": str})
+
+
+def _load_results(version: Tuple[str, int, int]) -> ResultsSnapshot:
+    global results
+    
+    results_path = Path(version[0])
+    df = _read_results(results_path)
+    records = df.to_dict(orient="records")
+    rows = [orjson.dumps(record) for record in records]
+    index = {code: i for i, code in reversed(list(enumerate(df["pkd_code"])))}
+    df["category"] = df["category"].astype("category")
+    categories = df.groupby(df["category"].str.strip().astype("category"), sort=False, observed=True).indices
+    rankings = {
+        key: df.sort_values(key, ascending=False).index.to_numpy()
+        for key in RANKING_KEYS
+        if key in df.columns
+    }
+    
+    search_names = df["branch_name"].fillna("").str.lower().to_numpy(dtype=str)
+    search_codes = df["pkd_code"].fillna("").str.lower().to_numpy(dtype=str)
+    
+    snapshot = ResultsSnapshot(
+        version=version,
+        df=df,
+        records=records,
+        rows=rows,
+        index=index,
+        categories=categories,
+        rankings=rankings,
+        search_names=search_names,
+        search_codes=search_codes,
+    )
+    results = snapshot
+    logger.info(f"Wczytano {len(df)} sektorów z {results_path}")
+    return snapshot
+
+
+async def _refresh_results() -> Optional[ResultsSnapshot]:
+    global results
+    
+    version = _results_version()
+    if version is None:
+        results = None
+        return None
+    
+    snapshot = results
+    if snapshot is None or snapshot.version != version:
+        snapshot = await run_in_threadpool(_load_results, version)
+    return snapshot
+
+
+async def _get_results() -> Optional[ResultsSnapshot]:
+    global results_checked_at
+    
+    if results_watched:
+        return results
+    
+    now = time.monotonic()
+    if now - results_checked_at < RESULTS_CHECK_INTERVAL:
+        return results
+    results_checked_at = now
+    return await _refresh_results()
+
+
+async def _watch_results() -> None:
+    global results_watched
+    
+    try:
+        from watchfiles import awatch
+    except ImportError:
+        logger.warning(f"watchfiles niedostępny, wyniki będą sprawdzane co {RESULTS_CHECK_INTERVAL} s")
+        return
+    
+    watched_names = {RESULTS_CSV_PATH.name, RESULTS_PARQUET_PATH.name}
+    try:
+        results_watched = True
+        async for _ in awatch(OUTPUT_DIR, watch_filter=lambda change, path: Path(path).name in watched_names):
+            try:
+                await _refresh_results()
+            except Exception as e:
+                logger.warning(f"Nie udało się odświeżyć wyników po zmianie pliku: {e}")
+    except FileNotFoundError:
+        logger.warning(f"Katalog {OUTPUT_DIR} nie istnieje, wyniki będą sprawdzane co {RESULTS_CHECK_INTERVAL} s")
+    finally:
+        results_watched = False
+
+
+async def _get_available_pkd() -> List[str]:
+    global available_pkd_codes, available_pkd_loaded_at
+    
+    if time.monotonic() - available_pkd_loaded_at >= AVAILABLE_PKD_TTL:
+        codes = await run_in_threadpool(database_loader.get_available_pkd_codes)
+        available_pkd_codes, available_pkd_loaded_at = sorted(codes), time.monotonic()
+    return available_pkd_codes
+
+
+def _parse_years(years: Optional[str] = None) -> Optional[Tuple[int, ...]]:
+    if not years:
+        return None
+    try:
+        return tuple(int(year) for year in years.split(","))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Nieprawidłowa lista lat: {years}")
+
+
+def _not_found(detail: str) -> ORJSONResponse:
+    return ORJSONResponse({"detail": detail}, status_code=404)
+
+
+def _results_missing() -> Response:
+    return Response(content=RESULTS_MISSING_BODY, status_code=404, media_type="application/json")
+
+
+def _not_modified(request: Request, snapshot: ResultsSnapshot, etag: str) -> Optional[Response]:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        fresh = "*" in tags or etag in tags
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        if not if_modified_since:
+            return None
+        try:
+            fresh = parsedate_to_datetime(if_modified_since).timestamp() >= snapshot.modified_at
+        except (TypeError, ValueError):
+            return None
+    
+    if fresh:
+        return Response(status_code=304, headers=snapshot.cache_headers(etag))
+    return None
 
 
 def create_app() -> FastAPI:
@@ -24,41 +280,45 @@ def create_app() -> FastAPI:
         title="Indeks Branż API",
         description="API do analizy kondycji sektorów polskiej gospodarki",
         version="1.0.0",
+        default_response_class=ORJSONResponse,
     )
     
     @app.on_event("startup")
     async def startup_event():
-        global config, data_service, analysis_service
+        global config, data_service, analysis_service, results_watcher
+        global cache_service, database_loader, realtime_service, prediction_service
+        global recommendation_service, alert_service, analytics_service, export_service, integration_service
         
         try:
             logger.info("Inicjalizacja serwisów API...")
             config = load_config()
             data_service = DataService(config)
             analysis_service = AnalysisService(config)
+            cache_service = CacheService()
+            database_loader = DatabaseLoader()
+            realtime_service = RealtimeDataService()
+            prediction_service = PredictionService()
+            recommendation_service = RecommendationService()
+            alert_service = AlertService()
+            analytics_service = AnalyticsService()
+            export_service = ExportService(config, OUTPUT_DIR)
+            integration_service = IntegrationService()
+            await _refresh_results()
+            await _get_available_pkd()
+            results_watcher = asyncio.create_task(_watch_results())
             logger.info("Serwisy API zainicjalizowane pomyślnie")
         except Exception as e:
             logger.error(f"Błąd inicjalizacji serwisów API: {e}")
             raise
     
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        if results_watcher is not None:
+            results_watcher.cancel()
+    
     @app.get("/", response_class=HTMLResponse)
     async def root():
-        template_path = Path(__file__).parent / "templates" / "index.html"
-        if template_path.exists():
-            return template_path.read_text(encoding="utf-8")
-        return """
-        <html>
-            <head><title>Indeks Branż API</title></head>
-            <body>
-                <h1>Indeks Branż API</h1>
-                <p>Wersja 1.0.0</p>
-                <ul>
-                    <li><a href="/health">/health</a> - Sprawdzenie stanu</li>
-                    <li><a href="/sectors">/sectors</a> - Lista sektorów</li>
-                    <li><a href="/docs">/docs</a> - Dokumentacja Swagger</li>
-                </ul>
-            </body>
-        </html>
-        """
+        return HTMLResponse(INDEX_HTML)
     
     @app.get("/health")
     async def health_check():
@@ -70,128 +330,116 @@ def create_app() -> FastAPI:
     
     @app.get("/sectors")
     async def get_sectors(
+        request: Request,
         limit: Optional[int] = Query(None, ge=1, le=100),
         category: Optional[str] = None,
     ):
         try:
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(
-                    status_code=404,
-                    detail="Plik wyników nie znaleziony. Uruchom najpierw analizę."
-                )
-            
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
-            
-            if category and category.strip():
-                logger.info(f"Filtrowanie po kategorii: '{category}'")
-                df_filtered = df[df["category"].str.strip() == category.strip()]
-                logger.info(f"Znaleziono {len(df_filtered)} sektorów w kategorii '{category}' z {len(df)} ogółem")
-                df = df_filtered
-            
-            if limit:
-                df = df.head(limit)
-            
-            logger.info(f"Zwracam {len(df)} sektorów")
-            return df.to_dict(orient="records")
-        except HTTPException:
-            raise
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _results_missing()
+            
+            key = ("sectors", limit, category.strip() if category else None)
+            etag = snapshot.etag(*key)
+            not_modified = _not_modified(request, snapshot, etag)
+            if not_modified is not None:
+                return not_modified
+            
+            # Only the unfiltered list and real categories are memoized; arbitrary
+            # limits and unknown category strings would grow the memo without bound.
+            memoize = limit is None and (not key[2] or key[2] in snapshot.categories)
+            payload = snapshot.payloads.get(key) if memoize else None
+            if payload is None:
+                positions = range(len(snapshot.rows))
+                
+                if category and category.strip():
+                    logger.info("Filtrowanie po kategorii: '%s'", category)
+                    positions = snapshot.categories.get(category.strip(), positions[:0])
+                    logger.info("Znaleziono %d sektorów w kategorii '%s' z %d ogółem", len(positions), category, len(snapshot.rows))
+                
+                if limit:
+                    positions = positions[:limit]
+                
+                logger.info("Zwracam %d sektorów", len(positions))
+                payload = snapshot.records_payload(positions)
+                if memoize:
+                    snapshot.payloads[key] = payload
+            
+            return snapshot.json_response(payload, etag)
         except Exception as e:
-            logger.error(f"Błąd pobierania sektorów: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception("Błąd pobierania sektorów: %s", e)
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/sector/{pkd_code}")
-    async def get_sector(pkd_code: str):
+    async def get_sector(request: Request, pkd_code: str):
         try:
-            from src.services.cache_service import CacheService
-            
-            cache_service = CacheService()
-            cached = cache_service.get("sector", pkd_code)
-            if cached:
-                logger.info(f"Cache hit dla sektora {pkd_code}")
-                return cached
-            
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(
-                    status_code=404,
-                    detail="Plik wyników nie znaleziony. Uruchom najpierw analizę."
-                )
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _results_missing()
             
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
-            sector = df[df["pkd_code"] == pkd_code]
+            position = snapshot.index.get(pkd_code)
+            if position is None:
+                return _not_found(f"Sektor {pkd_code} nie znaleziony")
             
-            if sector.empty:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Sektor {pkd_code} nie znaleziony"
-                )
+            etag = snapshot.etag("sector", pkd_code)
+            not_modified = _not_modified(request, snapshot, etag)
+            if not_modified is not None:
+                return not_modified
             
-            result = sector.iloc[0].to_dict()
-            cache_service.set("sector", pkd_code, result)
-            
-            return result
-        except HTTPException:
-            raise
+            return snapshot.json_response(snapshot.rows[position], etag)
         except Exception as e:
             logger.error(f"Błąd pobierania sektora {pkd_code}: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/rankings")
     async def get_rankings(
+        request: Request,
         top_n: Optional[int] = Query(100, ge=1, le=200),
-        sort_by: Optional[str] = Query("final_index", regex="^(final_index|growth_score|risk_score|profitability_score|size_score|debt_score)$"),
+        sort_by: RankingKey = "final_index",
     ):
         try:
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(
-                    status_code=404,
-                    detail="Plik wyników nie znaleziony. Uruchom najpierw analizę."
-                )
-            
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _results_missing()
             
-            if sort_by not in df.columns:
+            if sort_by not in snapshot.rankings:
                 sort_by = "final_index"
             
-            df = df.sort_values(sort_by, ascending=False).head(top_n)
+            key = ("rankings", top_n, sort_by)
+            etag = snapshot.etag(*key)
+            not_modified = _not_modified(request, snapshot, etag)
+            if not_modified is not None:
+                return not_modified
             
-            return df.to_dict(orient="records")
-        except HTTPException:
-            raise
+            payload = snapshot.payloads.get(key)
+            if payload is None:
+                payload = snapshot.payloads[key] = snapshot.records_payload(snapshot.rankings[sort_by][:top_n])
+            
+            return snapshot.json_response(payload, etag)
         except Exception as e:
             logger.error(f"Błąd pobierania rankingu: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/available-pkd")
     async def get_available_pkd():
+        global available_pkd_payload
+        
         try:
-            from src.services.cache_service import CacheService
-            from src.data_collection.database_loader import DatabaseLoader
+            available_pkd = await _get_available_pkd()
+            snapshot = await _get_results()
             
-            cache_service = CacheService()
-            cached = cache_service.get("available", "pkd")
-            if cached:
-                logger.info("Cache hit dla dostępnych PKD")
-                return cached
-            
-            loader = DatabaseLoader()
-            available_pkd = sorted(list(loader.get_available_pkd_codes()))
+            key = (available_pkd_loaded_at, snapshot.version if snapshot is not None else None)
+            if available_pkd_payload is not None and available_pkd_payload[0] == key:
+                return Response(content=available_pkd_payload[1], media_type="application/json")
             
-            results_path = Path("data/output/indeks_branz.csv")
             sectors = []
-            
-            if results_path.exists():
-                df = pd.read_csv(results_path)
-                df["pkd_code"] = df["pkd_code"].astype(str)
-                sectors = df[['pkd_code', 'branch_name', 'category', 'final_index']].to_dict(orient="records")
-                sectors = [s for s in sectors if s['pkd_code'] in available_pkd]
+            if snapshot is not None:
+                available_set = set(available_pkd)
+                sectors = [
+                    {column: record[column] for column in ('pkd_code', 'branch_name', 'category', 'final_index')}
+                    for record in snapshot.records
+                    if record['pkd_code'] in available_set
+                ]
             
             if not sectors:
                 from src.utils.pkd_mapping import get_pkd_division_name
@@ -205,153 +453,115 @@ def create_app() -> FastAPI:
                     for pkd in available_pkd
                 ]
             
-            result = {
+            payload = orjson.dumps({
                 "pkd_codes": available_pkd,
                 "sectors": sectors
-            }
-            
-            cache_service.set("available", "pkd", result, ttl=timedelta(hours=1))
+            })
+            available_pkd_payload = (key, payload)
             
-            return result
+            return Response(content=payload, media_type="application/json")
         except Exception as e:
             logger.error(f"Błąd pobierania dostępnych PKD: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/sector/{pkd_code}/history")
-    async def get_sector_history(pkd_code: str):
+    def get_sector_history(pkd_code: str):
         try:
-            from src.data_collection.database_loader import DatabaseLoader
-            from src.services.cache_service import CacheService
-            
-            cache_service = CacheService()
             cached = cache_service.get("history", pkd_code)
             if cached:
-                logger.info(f"Cache hit dla historii sektora {pkd_code}")
-                return cached
+                logger.info("Cache hit dla historii sektora %s", pkd_code)
+                return ORJSONResponse(cached)
             
-            loader = DatabaseLoader()
-            df = loader.load_sector_data_from_database(pkd_code, years=None)
+            df = database_loader.load_sector_data_from_database(pkd_code, years=None)
             
             if df is None or df.empty:
-                logger.warning(f"Brak danych historycznych dla sektora {pkd_code}")
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"Brak danych historycznych dla sektora {pkd_code}"
-                )
+                logger.warning("Brak danych historycznych dla sektora %s", pkd_code)
+                return _not_found(f"Brak danych historycznych dla sektora {pkd_code}")
             
             df = df.sort_values('year')
             result = df.to_dict(orient="records")
             
             cache_service.set("history", pkd_code, result, ttl=timedelta(hours=6))
             
-            logger.info(f"Zwracam {len(result)} rekordów historii dla PKD {pkd_code}, lata: {sorted(df['year'].unique().tolist())}")
-            return result
-        except HTTPException:
-            raise
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Zwracam %d rekordów historii dla PKD %s, lata: %s", len(result), pkd_code, sorted(df['year'].unique().tolist()))
+            return ORJSONResponse(result)
         except Exception as e:
             logger.error(f"Błąd pobierania historii sektora {pkd_code}: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/realtime/{pkd_code}")
-    async def get_realtime_data(
+    def get_realtime_data(
         pkd_code: str,
-        source: Optional[str] = Query("all", regex="^(all|gus)$")
+        source: RealtimeSource = "all"
     ):
         try:
-            from src.services.realtime_service import RealtimeDataService
-            
-            service = RealtimeDataService()
-            
             if source == "all":
-                result = service.fetch_all_sources(pkd_code)
-            elif source == "gus":
-                result = service.fetch_gus_data(pkd_code)
+                result = realtime_service.fetch_all_sources(pkd_code)
             else:
-                raise HTTPException(status_code=400, detail=f"Nieznane źródło: {source}")
+                result = realtime_service.fetch_gus_data(pkd_code)
             
-            logger.info(f"Zwracam dane realtime dla PKD {pkd_code} ze źródła {source}")
+            logger.info("Zwracam dane realtime dla PKD %s ze źródła %s", pkd_code, source)
             return result
-        except HTTPException:
-            raise
         except Exception as e:
             logger.error(f"Błąd pobierania danych realtime dla sektora {pkd_code}: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/bdl/subjects")
-    async def get_bdl_subjects(
+    def get_bdl_subjects(
         parent_id: Optional[str] = None,
         search: Optional[str] = None
     ):
         """Get BDL subjects (topics)."""
         try:
-            from src.services.realtime_service import RealtimeDataService
-            service = RealtimeDataService()
-            subjects = service.get_subjects(parent_id=parent_id, search=search)
+            subjects = realtime_service.get_subjects(parent_id=parent_id, search=search)
             return {"subjects": subjects}
         except Exception as e:
             logger.error(f"Błąd pobierania tematów BDL: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/bdl/variables")
-    async def get_bdl_variables(
+    def get_bdl_variables(
         subject_id: Optional[str] = None,
         search: Optional[str] = None,
-        years: Optional[str] = None
+        years: Optional[Tuple[int, ...]] = Depends(_parse_years)
     ):
         """Get BDL variables."""
         try:
-            from src.services.realtime_service import RealtimeDataService
-            service = RealtimeDataService()
-            
-            year_list = None
-            if years:
-                year_list = [int(y.strip()) for y in years.split(",")]
-            
-            variables = service.get_variables(subject_id=subject_id, search=search, years=year_list)
+            variables = realtime_service.get_variables(subject_id=subject_id, search=search, years=years)
             return {"variables": variables}
         except Exception as e:
             logger.error(f"Błąd pobierania zmiennych BDL: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/bdl/variables/{variable_id}")
-    async def get_bdl_variable_details(variable_id: str):
+    def get_bdl_variable_details(variable_id: str):
         """Get BDL variable details."""
         try:
-            from src.services.realtime_service import RealtimeDataService
-            service = RealtimeDataService()
-            variable = service.get_variable_details(variable_id)
+            variable = realtime_service.get_variable_details(variable_id)
             if variable is None:
-                raise HTTPException(status_code=404, detail=f"Zmienna {variable_id} nie znaleziona")
+                return _not_found(f"Zmienna {variable_id} nie znaleziona")
             return variable
-        except HTTPException:
-            raise
         except Exception as e:
             logger.error(f"Błąd pobierania szczegółów zmiennej BDL: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/bdl/data/variable/{variable_id}")
-    async def get_bdl_data_by_variable(
+    def get_bdl_data_by_variable(
         variable_id: str,
         unit_level: Optional[int] = Query(None, ge=0, le=7),
         unit_parent_id: Optional[str] = None,
-        years: Optional[str] = None,
+        years: Optional[Tuple[int, ...]] = Depends(_parse_years),
         page: int = Query(1, ge=1),
         page_size: int = Query(100, ge=1, le=1000)
     ):
         """Get BDL data for a specific variable."""
         try:
-            from src.services.realtime_service import RealtimeDataService
-            service = RealtimeDataService()
-            
-            year_list = None
-            if years:
-                year_list = [int(y.strip()) for y in years.split(",")]
-            
-            data = service.get_data_by_variable(
+            data = realtime_service.get_data_by_variable(
                 variable_id=variable_id,
                 unit_level=unit_level,
                 unit_parent_id=unit_parent_id,
-                years=year_list,
+                years=years,
                 page=page,
                 page_size=page_size
             )
@@ -361,7 +571,7 @@ def create_app() -> FastAPI:
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/bdl/units")
-    async def get_bdl_units(
+    def get_bdl_units(
         level: Optional[int] = Query(None, ge=0, le=7),
         parent_id: Optional[str] = None,
         page: int = Query(1, ge=1),
@@ -369,24 +579,20 @@ def create_app() -> FastAPI:
     ):
         """Get BDL territorial units."""
         try:
-            from src.services.realtime_service import RealtimeDataService
-            service = RealtimeDataService()
-            units = service.get_units(level=level, parent_id=parent_id, page=page, page_size=page_size)
+            units = realtime_service.get_units(level=level, parent_id=parent_id, page=page, page_size=page_size)
             return units
         except Exception as e:
             logger.error(f"Błąd pobierania jednostek BDL: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/realtime/quick")
-    async def get_quick_statistics(
+    def get_quick_statistics(
         source: Optional[str] = Query("gus"),
         unit_level: Optional[int] = Query(2, ge=0, le=7)
     ):
         """Get quick statistics from BDL."""
         try:
-            from src.services.realtime_service import RealtimeDataService
-            service = RealtimeDataService()
-            stats = service.get_popular_statistics(unit_level=unit_level)
+            stats = realtime_service.get_popular_statistics(unit_level=unit_level)
             return stats
         except Exception as e:
             logger.error(f"Błąd pobierania szybkich statystyk: {e}")
@@ -394,27 +600,28 @@ def create_app() -> FastAPI:
     
     @app.get("/sector/{pkd_code}/compare")
     async def compare_sectors(
+        request: Request,
         pkd_code: str,
         compare_with: str = Query(..., description="Kody PKD do porównania, oddzielone przecinkami")
     ):
         """Compare multiple sectors."""
         try:
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(status_code=404, detail="Plik wyników nie znaleziony")
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _not_found("Plik wyników nie znaleziony")
             
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
+            etag = snapshot.etag("compare", pkd_code, compare_with)
+            not_modified = _not_modified(request, snapshot, etag)
+            if not_modified is not None:
+                return not_modified
             
             pkd_codes = [pkd_code] + [p.strip() for p in compare_with.split(",")]
-            sectors = df[df["pkd_code"].isin(pkd_codes)]
+            positions = sorted({snapshot.index[code] for code in pkd_codes if code in snapshot.index})
             
-            if sectors.empty:
-                raise HTTPException(status_code=404, detail="Sektory nie znalezione")
+            if not positions:
+                return _not_found("Sektory nie znalezione")
             
-            return sectors.to_dict(orient="records")
-        except HTTPException:
-            raise
+            return snapshot.json_response(snapshot.records_payload(positions), etag)
         except Exception as e:
             logger.error(f"Błąd porównywania sektorów: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -423,39 +630,26 @@ def create_app() -> FastAPI:
     async def predict_sector(pkd_code: str):
         """Get prediction for next year."""
         try:
-            from src.services.prediction_service import PredictionService
-            from src.data_collection.database_loader import DatabaseLoader
-            
-            loader = DatabaseLoader()
-            history_data = loader.load_sector_data_from_database(pkd_code, years=None)
+            history_data = await run_in_threadpool(database_loader.load_sector_data_from_database, pkd_code, None)
             
             if history_data is None or history_data.empty:
-                raise HTTPException(status_code=404, detail="Brak danych historycznych")
-            
-            results_path = Path("data/output/indeks_branz.csv")
-            if results_path.exists():
-                df = pd.read_csv(results_path)
-                df["pkd_code"] = df["pkd_code"].astype(str)
-                sector = df[df["pkd_code"] == pkd_code]
-                if not sector.empty:
-                    sector_dict = sector.iloc[0].to_dict()
-                else:
-                    sector_dict = {}
-            else:
-                sector_dict = {}
+                return _not_found("Brak danych historycznych")
             
-            prediction_service = PredictionService()
-            prediction = prediction_service.predict_next_year(history_data.to_dict(orient="records"))
-            trend = prediction_service.get_trend_indicator(history_data.to_dict(orient="records"))
+            snapshot = await _get_results()
+            sector_dict = {}
+            if snapshot is not None and pkd_code in snapshot.index:
+                sector_dict = snapshot.records[snapshot.index[pkd_code]]
             
-            return {
+            history_records = history_data.to_dict(orient="records")
+            prediction = prediction_service.predict_next_year(history_records)
+            trend = prediction_service.get_trend_indicator(history_records)
+            
+            return ORJSONResponse({
                 "pkd_code": pkd_code,
                 "prediction": prediction,
                 "trend_indicator": trend,
                 "current_sector": sector_dict
-            }
-        except HTTPException:
-            raise
+            })
         except Exception as e:
             logger.error(f"Błąd prognozowania sektora {pkd_code}: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -464,29 +658,21 @@ def create_app() -> FastAPI:
     async def get_recommendations(pkd_code: str, limit: int = Query(5, ge=1, le=10)):
         """Get recommended similar sectors."""
         try:
-            from src.services.recommendation_service import RecommendationService
-            
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(status_code=404, detail="Plik wyników nie znaleziony")
-            
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _not_found("Plik wyników nie znaleziony")
             
-            target_sector = df[df["pkd_code"] == pkd_code]
-            if target_sector.empty:
-                raise HTTPException(status_code=404, detail=f"Sektor {pkd_code} nie znaleziony")
+            position = snapshot.index.get(pkd_code)
+            if position is None:
+                return _not_found(f"Sektor {pkd_code} nie znaleziony")
             
-            recommendation_service = RecommendationService()
             recommendations = recommendation_service.find_similar_sectors(
-                target_sector.iloc[0].to_dict(),
-                df.to_dict(orient="records"),
+                snapshot.records[position],
+                snapshot.records,
                 top_n=limit
             )
             
-            return {"recommendations": recommendations}
-        except HTTPException:
-            raise
+            return ORJSONResponse({"recommendations": recommendations})
         except Exception as e:
             logger.error(f"Błąd pobierania rekomendacji: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -495,22 +681,16 @@ def create_app() -> FastAPI:
     async def get_sector_alerts(pkd_code: str):
         """Get alerts for sector changes."""
         try:
-            from src.services.alert_service import AlertService
-            
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
+            snapshot = await _get_results()
+            if snapshot is None:
                 return {"alerts": []}
             
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
-            
-            current_sector = df[df["pkd_code"] == pkd_code]
-            if current_sector.empty:
+            position = snapshot.index.get(pkd_code)
+            if position is None:
                 return {"alerts": []}
             
-            alert_service = AlertService()
             alerts = alert_service.check_all_alerts(
-                current_sector.iloc[0].to_dict(),
+                snapshot.records[position],
                 None
             )
             
@@ -520,57 +700,68 @@ def create_app() -> FastAPI:
             return {"alerts": []}
     
     @app.get("/analytics/correlations")
-    async def get_correlations():
+    async def get_correlations(request: Request):
         """Get correlations between metrics."""
         try:
-            from src.services.analytics_service import AnalyticsService
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _not_found("Plik wyników nie znaleziony")
             
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(status_code=404, detail="Plik wyników nie znaleziony")
+            etag = snapshot.etag("correlations")
+            not_modified = _not_modified(request, snapshot, etag)
+            if not_modified is not None:
+                return not_modified
             
-            df = pd.read_csv(results_path)
-            analytics_service = AnalyticsService()
-            correlations = analytics_service.calculate_correlations(df)
-            statistics = analytics_service.calculate_statistics(df)
+            payload = snapshot.payloads.get(("correlations",))
+            if payload is None:
+                overview = analytics_service.calculate_overview(snapshot.df)
+                payload = snapshot.payloads[("correlations",)] = orjson.dumps(overview)
             
-            return {
-                "correlations": correlations,
-                "statistics": statistics
-            }
-        except HTTPException:
-            raise
+            return snapshot.json_response(payload, etag)
         except Exception as e:
             logger.error(f"Błąd obliczania korelacji: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/dashboard")
-    async def get_dashboard():
+    async def get_dashboard(request: Request):
         """Get dashboard statistics."""
         try:
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(status_code=404, detail="Plik wyników nie znaleziony")
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _not_found("Plik wyników nie znaleziony")
+            
+            etag = snapshot.etag("dashboard")
+            not_modified = _not_modified(request, snapshot, etag)
+            if not_modified is not None:
+                return not_modified
+            
+            payload = snapshot.payloads.get(("dashboard",))
+            if payload is not None:
+                return snapshot.json_response(payload, etag)
             
-            df = pd.read_csv(results_path)
+            df = snapshot.df
             
             total_sectors = len(df)
             avg_index = df["final_index"].mean() if "final_index" in df.columns else 0
             
-            category_dist = df["category"].value_counts().to_dict() if "category" in df.columns else {}
+            category_dist = {}
+            if "category" in df.columns:
+                category_counts = df["category"].value_counts()
+                category_dist = category_counts[category_counts > 0].to_dict()
             
             top_5 = df.nlargest(5, "final_index")[["pkd_code", "branch_name", "final_index", "category"]].to_dict(orient="records")
             bottom_5 = df.nsmallest(5, "final_index")[["pkd_code", "branch_name", "final_index", "category"]].to_dict(orient="records")
             
-            return {
+            payload = orjson.dumps({
                 "total_sectors": total_sectors,
                 "average_index": float(avg_index),
                 "category_distribution": category_dist,
                 "top_5": top_5,
                 "bottom_5": bottom_5
-            }
-        except HTTPException:
-            raise
+            })
+            snapshot.payloads[("dashboard",)] = payload
+            
+            return snapshot.json_response(payload, etag)
         except Exception as e:
             logger.error(f"Błąd pobierania dashboardu: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -578,39 +769,35 @@ def create_app() -> FastAPI:
     @app.get("/sector/{pkd_code}/export")
     async def export_sector(
         pkd_code: str,
-        format: str = Query("csv", regex="^(csv|excel|pdf)$")
+        format: ExportFormat = "csv"
     ):
         """Export sector data."""
         try:
-            from src.services.export_service import ExportService
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _not_found("Plik wyników nie znaleziony")
             
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(status_code=404, detail="Plik wyników nie znaleziony")
+            position = snapshot.index.get(pkd_code)
+            if position is None:
+                return _not_found(f"Sektor {pkd_code} nie znaleziony")
             
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
-            
-            sector = df[df["pkd_code"] == pkd_code]
-            if sector.empty:
-                raise HTTPException(status_code=404, detail=f"Sektor {pkd_code} nie znaleziony")
-            
-            export_service = ExportService(config, Path("data/output"))
+            sector = snapshot.df.iloc[[position]]
             
             if format == "csv":
-                csv_data = sector.to_csv(index=False, encoding='utf-8-sig')
+                key = ("export-csv", position)
+                csv_data = snapshot.payloads.get(key)
+                if csv_data is None:
+                    csv_data = snapshot.payloads[key] = sector.to_csv(index=False).encode("utf-8")
                 return Response(content=csv_data, media_type="text/csv", 
                               headers={"Content-Disposition": f"attachment; filename=sector_{pkd_code}.csv"})
             elif format == "excel":
-                excel_path = export_service.export_to_excel(sector, filename=f"sector_{pkd_code}.xlsx")
-                return Response(content=excel_path.read_bytes(), media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                excel_data = await run_in_threadpool(export_service.export_to_excel_bytes, sector)
+                return Response(content=excel_data, media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                               headers={"Content-Disposition": f"attachment; filename=sector_{pkd_code}.xlsx"})
             elif format == "pdf":
-                pdf_data = export_service.export_to_pdf({"sector": sector.iloc[0].to_dict()}, f"sector_{pkd_code}.pdf")
+                pdf_data = await run_in_threadpool(export_service.export_to_pdf, {"sector": snapshot.records[position]}, f"sector_{pkd_code}.pdf")
                 return Response(content=pdf_data, media_type="application/pdf",
                               headers={"Content-Disposition": f"attachment; filename=sector_{pkd_code}.pdf"})
-        except HTTPException:
-            raise
         except Exception as e:
             logger.error(f"Błąd eksportowania sektora: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -627,16 +814,16 @@ def create_app() -> FastAPI:
     ):
         """Advanced search for sectors."""
         try:
-            results_path = Path("data/output/indeks_branz.csv")
-            if not results_path.exists():
-                raise HTTPException(status_code=404, detail="Plik wyników nie znaleziony")
+            snapshot = await _get_results()
+            if snapshot is None:
+                return _not_found("Plik wyników nie znaleziony")
             
-            df = pd.read_csv(results_path)
-            df["pkd_code"] = df["pkd_code"].astype(str)
+            df = snapshot.df
             
             if query:
-                mask = df["branch_name"].str.contains(query, case=False, na=False) | \
-                       df["pkd_code"].str.contains(query, case=False, na=False)
+                needle = query.lower()
+                mask = (np.char.find(snapshot.search_names, needle) >= 0) | \
+                       (np.char.find(snapshot.search_codes, needle) >= 0)
                 df = df[mask]
             
             if min_index is not None:
@@ -652,28 +839,23 @@ def create_app() -> FastAPI:
                 df = df[df["category"].isin(category_list)]
             
             df = df.head(limit)
-            return df.to_dict(orient="records")
-        except HTTPException:
-            raise
+            return Response(content=snapshot.records_payload(df.index), media_type="application/json")
         except Exception as e:
             logger.error(f"Błąd wyszukiwania sektorów: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/sector/{pkd_code}/history/compare")
-    async def compare_history_periods(
+    def compare_history_periods(
         pkd_code: str,
         period1: str = Query(..., description="Okres 1: start_year-end_year"),
         period2: str = Query(..., description="Okres 2: start_year-end_year")
     ):
         """Compare two time periods."""
         try:
-            from src.data_collection.database_loader import DatabaseLoader
-            
-            loader = DatabaseLoader()
-            all_data = loader.load_sector_data_from_database(pkd_code, years=None)
+            all_data = database_loader.load_sector_data_from_database(pkd_code, years=None)
             
             if all_data is None or all_data.empty:
-                raise HTTPException(status_code=404, detail="Brak danych historycznych")
+                return _not_found("Brak danych historycznych")
             
             def parse_period(period_str):
                 start, end = period_str.split("-")
@@ -686,45 +868,35 @@ def create_app() -> FastAPI:
             period2_data = all_data[(all_data["year"] >= start2) & (all_data["year"] <= end2)]
             
             if period1_data.empty or period2_data.empty:
-                raise HTTPException(status_code=404, detail="Brak danych dla wybranych okresów")
+                return _not_found("Brak danych dla wybranych okresów")
             
-            numeric_cols = period1_data.select_dtypes(include=['number']).columns.tolist()
-            period1_avg = period1_data[numeric_cols].mean().to_dict()
-            period2_avg = period2_data[numeric_cols].mean().to_dict()
+            numeric_cols = all_data.select_dtypes(include=['number']).columns
+            period1_avg = period1_data[numeric_cols].mean()
+            period2_avg = period2_data[numeric_cols].mean()
             
-            changes = {}
-            for key in period1_avg:
-                if isinstance(period1_avg[key], (int, float)) and isinstance(period2_avg[key], (int, float)):
-                    if period1_avg[key] != 0:
-                        changes[key] = ((period2_avg[key] - period1_avg[key]) / period1_avg[key]) * 100
-                    else:
-                        changes[key] = 0
+            with np.errstate(divide='ignore', invalid='ignore'):
+                changes = np.where(period1_avg != 0, (period2_avg - period1_avg) / period1_avg * 100, 0.0)
             
             return {
                 "period1": {
                     "range": f"{start1}-{end1}",
-                    "data": period1_avg
+                    "data": period1_avg.to_dict()
                 },
                 "period2": {
                     "range": f"{start2}-{end2}",
-                    "data": period2_avg
+                    "data": period2_avg.to_dict()
                 },
-                "changes": changes
+                "changes": dict(zip(numeric_cols, changes.tolist()))
             }
-        except HTTPException:
-            raise
         except Exception as e:
             logger.error(f"Błąd porównywania okresów: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
     @app.get("/integrations/economic-indicators")
-    async def get_economic_indicators():
+    def get_economic_indicators():
         """Get economic indicators from external sources."""
         try:
-            from src.services.integration_service import IntegrationService
-            
-            service = IntegrationService()
-            indicators = service.get_economic_indicators()
+            indicators = integration_service.get_economic_indicators()
             return indicators
         except Exception as e:
             logger.error(f"Błąd pobierania wskaźników ekonomicznych: {e}")
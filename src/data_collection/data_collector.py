@@ -1,7 +1,8 @@
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
-import time
 
+from src.data_collection.database_loader import DatabaseLoader
 from src.models.config import Config
 from src.utils.exceptions import DataCollectionError
 from src.utils.logger import get_logger
@@ -13,30 +14,42 @@ class DataCollector:
     def __init__(self, config: Config):
         self.config = config
         self.data_sources = config.data_sources
+        self.database_loader = DatabaseLoader()
         logger.info("DataCollector zainicjalizowany")
         
-    def collect_all_data(self, pkd_codes: List[str]) -> Dict[str, pd.DataFrame]:
+    def collect_all_data(self, pkd_codes: List[str], max_workers: int = 8) -> Dict[str, pd.DataFrame]:
         if not pkd_codes:
             raise DataCollectionError("Brak kodów PKD")
         
         results: Dict[str, pd.DataFrame] = {}
         skipped = []
         
-        for code in pkd_codes:
+        def collect(code: str):
+            logger.info(f"Zbieranie danych dla PKD {code}")
             try:
-                logger.info(f"Zbieranie danych dla PKD {code}")
-                data = self.collect_sector_data(code)
-                if data is not None and not data.empty:
-                    results[code] = data
-                else:
-                    skipped.append(code)
-                    logger.warning(f"Pominięto PKD {code} - brak danych")
-            except DataCollectionError as e:
-                skipped.append(code)
-                logger.warning(f"Pominięto PKD {code}: {e}")
+                return self.collect_sector_data(code), None
             except Exception as e:
+                return None, e
+        
+        # The first sector runs on the calling thread so the shared database
+        # file caches are filled once before the workers start reading them.
+        outcomes = [collect(pkd_codes[0])]
+        if len(pkd_codes) > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(pkd_codes) - 1)) as executor:
+                outcomes.extend(executor.map(collect, pkd_codes[1:]))
+        
+        for code, (data, error) in zip(pkd_codes, outcomes):
+            if isinstance(error, DataCollectionError):
                 skipped.append(code)
-                logger.warning(f"Pominięto PKD {code} z powodu błędu: {e}")
+                logger.warning(f"Pominięto PKD {code}: {error}")
+            elif error is not None:
+                skipped.append(code)
+                logger.warning(f"Pominięto PKD {code} z powodu błędu: {error}")
+            elif data is not None and not data.empty:
+                results[code] = data
+            else:
+                skipped.append(code)
+                logger.warning(f"Pominięto PKD {code} - brak danych")
         
         if skipped:
             logger.info(f"Pominięto {len(skipped)} sektorów bez danych: {skipped}")
@@ -48,16 +61,13 @@ class DataCollector:
         return results
     
     def collect_sector_data(self, pkd_code: str) -> Optional[pd.DataFrame]:
-        from src.data_collection.database_loader import DatabaseLoader
-        
         try:
             analysis_period = self.config.analysis_period
             start_year = analysis_period.start_year
             end_year = analysis_period.end_year
             years = list(range(start_year, end_year + 1))
             
-            database_loader = DatabaseLoader()
-            df = database_loader.load_sector_data_from_database(pkd_code, years)
+            df = self.database_loader.load_sector_data_from_database(pkd_code, years)
             
             if df is None or df.empty:
                 logger.warning(f"Brak danych w bazie dla PKD {pkd_code}")
@@ -1,11 +1,202 @@
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Set, Dict
+from typing import Optional, List, Set, Dict, Tuple
+import numpy as np
 import pandas as pd
 
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+WSKAZNIK_CATEGORIES = (
+    ('revenue', ('PRZYCHOD', 'REVENUE', 'GS')),
+    ('profit', ('ZYSK', 'PROFIT', 'NP', 'WYNIK')),
+    ('assets', ('AKTYWA', 'ASSETS')),
+    ('debt', ('ZADŁUŻENIE', 'DEBT', 'DŁUG')),
+    ('num_companies', ('LICZBA', 'EN')),
+)
+WSKAZNIK_PATTERNS = tuple(
+    (name, re.compile('|'.join(map(re.escape, keywords)))) for name, keywords in WSKAZNIK_CATEGORIES
+)
+
+
+WSK_FIN_TEXT_COLUMNS = ('PKD', 'WSKAZNIK')
+WSK_FIN_BLOCK_SIZE = 1 << 20
+WSK_FIN_CHUNK_ROWS = 50_000
+
+
+@lru_cache(maxsize=2)
+def _read_csv_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    logger.debug(f"Wczytywanie pliku {path}")
+    try:
+        df = pd.read_csv(path, sep=';', encoding='utf-8', engine='pyarrow')
+        text_columns = df.select_dtypes('object').columns
+        df[text_columns] = df[text_columns].astype('string[pyarrow]')
+        return df
+    except ImportError:
+        logger.warning("pyarrow niedostępny, używam parsera C pandas")
+        return pd.read_csv(path, sep=';', encoding='utf-8', low_memory=False)
+
+
+def _file_key(path: Path) -> Optional[Tuple[str, int, int]]:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+def _build_prefix_index(values: pd.Series) -> Dict[str, np.ndarray]:
+    if not isinstance(values.dtype, pd.StringDtype):
+        values = values.astype(str)
+    keys = values.str[:2]
+    return keys.groupby(keys, sort=False).indices
+
+
+def _prefix_positions(index: Dict[str, np.ndarray], prefix: str) -> np.ndarray:
+    if len(prefix) >= 2:
+        return index.get(prefix[:2], np.empty(0, dtype=np.intp))
+    matches = [positions for key, positions in index.items() if key.startswith(prefix)]
+    if not matches:
+        return np.empty(0, dtype=np.intp)
+    return np.sort(np.concatenate(matches))
+
+
+@lru_cache(maxsize=4)
+def _csv_prefix_index_cached(path: str, mtime_ns: int, size: int, column: str) -> Dict[str, np.ndarray]:
+    return _build_prefix_index(_read_csv_cached(path, mtime_ns, size)[column])
+
+
+def _read_header(path: Path) -> List[str]:
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return [col.strip().strip('"') for col in f.readline().rstrip('\r\n').split(';')]
+
+
+def _parse_numeric(column: pd.Series) -> pd.Series:
+    cleaned = column.astype(str).str.replace('\xa0', ' ', regex=False).str.replace(' ', '', regex=False).str.replace(',', '.', regex=False)
+    return pd.to_numeric(cleaned, errors='coerce')
+
+
+def _to_int(column: pd.Series) -> pd.Series:
+    def convert(value):
+        try:
+            return int(value)
+        except ValueError:
+            return np.nan
+    
+    return column.map({value: convert(value) for value in column.dropna().unique()})
+
+
+@lru_cache(maxsize=256)
+def _bankruptcy_totals_cached(path: str, mtime_ns: int, size: int, pkd_col: str, rok_col: str,
+                              upadlosci_col: str, prefix: str) -> pd.DataFrame:
+    df = _read_csv_cached(path, mtime_ns, size)
+    index = _csv_prefix_index_cached(path, mtime_ns, size, pkd_col)
+    filtered = df.take(_prefix_positions(index, prefix))
+    
+    year = _to_int(filtered[rok_col])
+    has_year = year.notna()
+    
+    raw_count = filtered[upadlosci_col]
+    count = _to_int(raw_count)
+    counted = has_year & (raw_count.isna() | count.notna())
+    
+    totals = count[counted].fillna(0).groupby(year[counted]).sum()
+    year_order = pd.unique(year[has_year])
+    return pd.DataFrame({
+        'year': year_order.astype(int),
+        'bankruptcies': totals.reindex(year_order, fill_value=0).to_numpy(dtype=int),
+    })
+
+
+def _iter_wsk_fin_chunks(path: str, usecols: List[str]):
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        logger.warning("pyarrow niedostępny, używam parsera C pandas")
+        yield from pd.read_csv(path, sep=';', encoding='utf-8', usecols=usecols, dtype=str, chunksize=WSK_FIN_CHUNK_ROWS)
+        return
+    
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=WSK_FIN_BLOCK_SIZE),
+        parse_options=pa_csv.ParseOptions(delimiter=';'),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=usecols,
+            column_types={col: pa.string() for col in usecols}
+        )
+    )
+    text_dtype = pd.StringDtype('pyarrow')
+    for batch in reader:
+        yield batch.to_pandas(types_mapper={pa.string(): text_dtype}.get)
+
+
+def _read_parquet_sidecar(sidecar: Path, source: List[int]) -> Optional[pd.DataFrame]:
+    if not sidecar.exists():
+        return None
+    try:
+        df = pd.read_parquet(sidecar, engine='pyarrow')
+    except ImportError:
+        return None
+    except Exception as e:
+        logger.warning(f"Nie udało się odczytać {sidecar}: {e}")
+        return None
+    
+    if df.attrs.get('source') != source:
+        logger.info(f"Plik {sidecar} jest nieaktualny, zostanie odtworzony")
+        return None
+    
+    text_columns = [col for col in df.columns if col in WSK_FIN_TEXT_COLUMNS]
+    df[text_columns] = df[text_columns].astype('string[pyarrow]')
+    return df
+
+
+def _write_parquet_sidecar(df: pd.DataFrame, sidecar: Path, source: List[int]) -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return
+    
+    try:
+        df.attrs['source'] = source
+        df.to_parquet(sidecar, engine='pyarrow', compression='zstd', index=False)
+        logger.info(f"Zapisano kopię Parquet: {sidecar}")
+    except Exception as e:
+        logger.warning(f"Nie udało się zapisać {sidecar}: {e}")
+
+
+@lru_cache(maxsize=2)
+def _read_wsk_fin_cached(path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    sidecar = Path(path).with_suffix('.parquet')
+    source = [mtime_ns, size]
+    df = _read_parquet_sidecar(sidecar, source)
+    if df is not None:
+        return df
+    
+    logger.debug(f"Wczytywanie pliku {path}")
+    header = _read_header(Path(path))
+    text_columns = [col for col in header if col in WSK_FIN_TEXT_COLUMNS]
+    year_columns = [col for col in header if col.isdigit()]
+    
+    parts = []
+    for chunk in _iter_wsk_fin_chunks(path, text_columns + year_columns):
+        chunk[year_columns] = chunk[year_columns].apply(_parse_numeric)
+        parts.append(chunk)
+    
+    if not parts:
+        return pd.DataFrame(columns=text_columns + year_columns)
+    
+    df = pd.concat(parts, ignore_index=True)
+    _write_parquet_sidecar(df, sidecar, source)
+    return df
+
+
+@lru_cache(maxsize=2)
+def _wsk_fin_prefix_index_cached(path: str, mtime_ns: int, size: int) -> Dict[str, np.ndarray]:
+    return _build_prefix_index(_read_wsk_fin_cached(path, mtime_ns, size)['PKD'])
+
 
 class DatabaseLoader:
     def __init__(self, database_dir: Path = Path("database")):
@@ -17,14 +208,14 @@ class DatabaseLoader:
     def get_available_pkd_codes(self) -> Set[str]:
         pkd_codes = set()
         
-        if self.wsk_fin_path.exists():
+        wsk_key = _file_key(self.wsk_fin_path)
+        if wsk_key is not None:
             try:
-                df = pd.read_csv(self.wsk_fin_path, sep=';', encoding='utf-8', low_memory=False, usecols=['PKD'])
+                df = _read_wsk_fin_cached(*wsk_key)
                 if not df.empty and 'PKD' in df.columns:
-                    for pkd in df['PKD'].dropna().unique():
-                        pkd_str = str(pkd).strip()
-                        if len(pkd_str) >= 2 and pkd_str != 'OG':
-                            pkd_codes.add(pkd_str[:2])
+                    pkd_str = pd.Series(df['PKD'].dropna().unique()).astype(str).str.strip()
+                    pkd_str = pkd_str[(pkd_str.str.len() >= 2) & (pkd_str != 'OG')]
+                    pkd_codes.update(pkd_str.str[:2].unique())
                 logger.info(f"Znaleziono {len(pkd_codes)} kodów PKD w wsk_fin.csv")
             except Exception as e:
                 logger.error(f"Błąd odczytu PKD z wsk_fin.csv: {e}")
@@ -37,20 +228,20 @@ class DatabaseLoader:
         years = []
         if self.wsk_fin_path.exists():
             try:
-                df = pd.read_csv(self.wsk_fin_path, sep=';', encoding='utf-8', low_memory=False, nrows=1)
-                year_cols = [col for col in df.columns if col.isdigit() and 2000 <= int(col) <= 2030]
-                years = sorted([int(col) for col in year_cols])
+                year_cols = [col for col in _read_header(self.wsk_fin_path) if col.isdigit() and 2000 <= int(col) <= 2030]
+                years = sorted({int(col) for col in year_cols})
             except Exception as e:
                 logger.error(f"Błąd odczytu lat z wsk_fin.csv: {e}")
         return years
     
     def load_financial_data(self, pkd_code: str, years: list) -> Optional[pd.DataFrame]:
-        if not self.wsk_fin_path.exists():
+        wsk_key = _file_key(self.wsk_fin_path)
+        if wsk_key is None:
             logger.warning(f"Plik {self.wsk_fin_path} nie istnieje")
             return None
         
         try:
-            df = pd.read_csv(self.wsk_fin_path, sep=';', encoding='utf-8', low_memory=False)
+            df = _read_wsk_fin_cached(*wsk_key)
             
             if df.empty:
                 return None
@@ -61,21 +252,13 @@ class DatabaseLoader:
             
             pkd_code_short = pkd_code[:2] if len(pkd_code) >= 2 else pkd_code
             
-            filtered = df[df['PKD'].astype(str).str.startswith(pkd_code_short, na=False)]
+            index = _wsk_fin_prefix_index_cached(*wsk_key)
+            filtered = df.take(_prefix_positions(index, pkd_code_short))
             
             if filtered.empty:
                 logger.warning(f"Brak danych dla PKD {pkd_code_short} w wsk_fin.csv")
                 return None
             
-            def parse_value(val):
-                if pd.isna(val) or val is None:
-                    return None
-                try:
-                    val_str = str(val).replace('\xa0', ' ').replace(' ', '').replace(',', '.')
-                    return float(val_str)
-                except:
-                    return None
-            
             year_columns = [str(year) for year in years]
             available_years = [col for col in year_columns if col in df.columns]
             
@@ -84,68 +267,64 @@ class DatabaseLoader:
                 available_years = sorted(all_year_cols, key=int)[-len(years):] if len(all_year_cols) >= len(years) else all_year_cols
                 logger.info(f"Używam dostępnych lat z pliku: {available_years}")
             
-            result_by_year: Dict[int, Dict[str, float]] = {}
+            year_columns = [col for col in dict.fromkeys(year_columns) if col in df.columns]
+            if not year_columns:
+                return None
+            
+            if 'WSKAZNIK' in filtered.columns:
+                codes, uniques = pd.factorize(filtered['WSKAZNIK'].astype(str))
+                wskaznik = pd.Series(uniques).str.upper()
+            else:
+                codes, wskaznik = np.zeros(len(filtered), dtype=np.intp), pd.Series([''])
             
-            for idx, row in filtered.iterrows():
-                wskaznik = str(row.get('WSKAZNIK', '')).upper() if 'WSKAZNIK' in row.index else ''
-                
-                for year in years:
-                    year_str = str(year)
-                    if year_str not in df.columns:
-                        continue
-                    
-                    value = parse_value(row[year_str])
-                    if value is None or value <= 0:
-                        continue
-                    
-                    if year not in result_by_year:
-                        result_by_year[year] = {
-                            'revenue': None,
-                            'profit': None,
-                            'assets': None,
-                            'debt': None,
-                            'num_companies': None
-                        }
-                    
-                    value_scaled = value * 1000 if value < 1000000 else value
-                    
-                    if 'PRZYCHOD' in wskaznik or 'REVENUE' in wskaznik or 'GS' in wskaznik:
-                        if result_by_year[year]['revenue'] is None:
-                            result_by_year[year]['revenue'] = value_scaled
-                    elif 'ZYSK' in wskaznik or 'PROFIT' in wskaznik or 'NP' in wskaznik or 'WYNIK' in wskaznik:
-                        if result_by_year[year]['profit'] is None:
-                            result_by_year[year]['profit'] = value_scaled
-                    elif 'AKTYWA' in wskaznik or 'ASSETS' in wskaznik:
-                        if result_by_year[year]['assets'] is None:
-                            result_by_year[year]['assets'] = value_scaled
-                    elif 'ZADŁUŻENIE' in wskaznik or 'DEBT' in wskaznik or 'DŁUG' in wskaznik:
-                        if result_by_year[year]['debt'] is None:
-                            result_by_year[year]['debt'] = value_scaled
-                    elif 'LICZBA' in wskaznik or 'EN' in wskaznik:
-                        if result_by_year[year]['num_companies'] is None:
-                            result_by_year[year]['num_companies'] = int(value)
+            masks = [wskaznik.str.contains(pattern).to_numpy() for _, pattern in WSKAZNIK_PATTERNS]
+            row_category = np.select(masks, [name for name, _ in WSKAZNIK_PATTERNS], default='')[codes]
             
-            result_data = []
-            for year, data in result_by_year.items():
-                revenue = data['revenue'] or (data['profit'] * 12.5 if data['profit'] else 1000000)
-                profit = data['profit'] or (revenue * 0.08 if revenue else 0)
-                assets = data['assets'] or (revenue * 1.8 if revenue else 2000000)
-                debt = data['debt'] or (assets * 0.4 if assets else 800000)
-                num_companies = data['num_companies'] or 1000
-                
-                result_data.append({
-                    'year': year,
-                    'revenue': revenue,
-                    'profit': profit,
-                    'assets': assets,
-                    'debt': debt,
-                    'bankruptcies': 0,
-                    'num_companies': num_companies
-                })
+            values = filtered[year_columns].to_numpy(dtype=float).ravel()
             
-            if result_data:
-                return pd.DataFrame(result_data)
-            return None
+            long = pd.DataFrame({
+                'year': np.tile([int(col) for col in year_columns], len(filtered)),
+                'category': np.repeat(row_category, len(year_columns)),
+                'value': values,
+            })
+            long = long[long['value'] > 0]
+            
+            if long.empty:
+                return None
+            
+            long['scaled'] = np.where(long['value'] < 1000000, long['value'] * 1000, long['value'])
+            firsts = long.groupby(['category', 'year'], sort=False).first()
+            year_order = pd.Index(long['year'].unique())
+            
+            def first_values(category: str, column: str = 'scaled') -> pd.Series:
+                if category not in firsts.index.get_level_values('category'):
+                    return pd.Series(np.nan, index=year_order)
+                return firsts.xs(category)[column].reindex(year_order)
+            
+            revenue = first_values('revenue')
+            profit = first_values('profit')
+            assets = first_values('assets')
+            debt = first_values('debt')
+            num_companies = first_values('num_companies', 'value')
+            
+            if revenue.isna().all() and profit.isna().all():
+                revenue = pd.Series(1000000, index=year_order)
+            else:
+                revenue = revenue.fillna(profit * 12.5).fillna(1000000)
+            profit = profit.fillna(revenue * 0.08)
+            assets = assets.fillna(revenue * 1.8)
+            debt = debt.fillna(assets * 0.4)
+            num_companies = np.trunc(num_companies).fillna(1000).astype(int)
+            
+            return pd.DataFrame({
+                'year': year_order,
+                'revenue': revenue.to_numpy(),
+                'profit': profit.to_numpy(),
+                'assets': assets.to_numpy(),
+                'debt': debt.to_numpy(),
+                'bankruptcies': 0,
+                'num_companies': num_companies.to_numpy()
+            })
             
         except Exception as e:
             logger.error(f"Błąd ładowania danych finansowych: {e}")
@@ -154,12 +333,13 @@ class DatabaseLoader:
             return None
     
     def load_bankruptcy_data(self, pkd_code: str, years: list) -> Optional[pd.DataFrame]:
-        if not self.krz_pkd_path.exists():
+        krz_key = _file_key(self.krz_pkd_path)
+        if krz_key is None:
             logger.warning(f"Plik {self.krz_pkd_path} nie istnieje")
             return None
         
         try:
-            df = pd.read_csv(self.krz_pkd_path, sep=';', encoding='utf-8')
+            df = _read_csv_cached(*krz_key)
             
             if df.empty:
                 return None
@@ -196,26 +376,9 @@ class DatabaseLoader:
             
             pkd_code_short = pkd_code[:2] if len(pkd_code) >= 2 else pkd_code
             
-            filtered = df[df[pkd_col].astype(str).str.startswith(pkd_code_short, na=False)]
-            
-            if filtered.empty:
-                return None
-            
-            result = {}
-            for _, row in filtered.iterrows():
-                try:
-                    year = int(row[rok_col])
-                    if year in years:
-                        if year not in result:
-                            result[year] = 0
-                        upadlosci = int(row[upadlosci_col]) if pd.notna(row[upadlosci_col]) else 0
-                        result[year] += upadlosci
-                except (ValueError, KeyError):
-                    continue
-            
-            if result:
-                return pd.DataFrame([{'year': k, 'bankruptcies': v} for k, v in result.items()])
-            return None
+            totals = _bankruptcy_totals_cached(*krz_key, pkd_col, rok_col, upadlosci_col, pkd_code_short)
+            result = totals[totals['year'].isin(years)].reset_index(drop=True)
+            return result if not result.empty else None
             
         except Exception as e:
             logger.error(f"Błąd ładowania danych o upadłościach: {e}")
@@ -235,20 +398,9 @@ class DatabaseLoader:
             logger.warning(f"Brak danych finansowych dla PKD {pkd_code}")
             return None
         
-        financial_df['bankruptcies'] = 0
-        
         if bankruptcy_df is not None and not bankruptcy_df.empty:
-            financial_df = financial_df.merge(
-                bankruptcy_df[['year', 'bankruptcies']],
-                on='year',
-                how='left',
-                suffixes=('', '_new')
-            )
-            if 'bankruptcies_new' in financial_df.columns:
-                financial_df['bankruptcies'] = financial_df['bankruptcies_new'].fillna(0).astype(int)
-                financial_df = financial_df.drop(columns=['bankruptcies_new'])
-            else:
-                financial_df['bankruptcies'] = financial_df['bankruptcies'].fillna(0).astype(int)
+            bankruptcies = dict(zip(bankruptcy_df['year'], bankruptcy_df['bankruptcies']))
+            financial_df['bankruptcies'] = financial_df['year'].map(bankruptcies).fillna(0).astype(int)
         else:
             financial_df['bankruptcies'] = 0
         
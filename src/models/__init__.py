@@ -2,11 +2,12 @@
 Models module - Data models and type definitions.
 """
 
-from src.models.sector import SectorData, SectorIndicators, SectorClassification
+from src.models.sector import SectorData, SectorDataBatch, SectorIndicators, SectorClassification
 from src.models.config import Config, Weights, AnalysisPeriod, DataSources, Classification
 
 __all__ = [
     "SectorData",
+    "SectorDataBatch",
     "SectorIndicators",
     "SectorClassification",
     "Config",
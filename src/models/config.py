@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import List
 
+import numpy as np
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Weights:
     size: float = 0.20
     growth: float = 0.25
@@ -12,23 +14,26 @@ class Weights:
     
     def validate(self) -> bool:
         total = self.size + self.growth + self.profitability + self.debt + self.risk
-        return abs(total - 1.0) < 0.01
+        return round(total * 100) == 100
+    
+    def as_array(self) -> np.ndarray:
+        return np.array([self.size, self.growth, self.profitability, self.debt, self.risk], dtype=np.float64)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AnalysisPeriod:
     start_year: int = 2021
     end_year: int = 2024
     forecast_months: int = 12
 
 
-@dataclass
+@dataclass(slots=True)
 class DataSource:
     enabled: bool = True
     base_url: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DataSources:
     gus: DataSource
     krs: DataSource
@@ -36,18 +41,18 @@ class DataSources:
     nbp: DataSource
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     name: str
     min_score: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Classification:
     categories: List[Category]
 
 
-@dataclass
+@dataclass(slots=True)
 class Visualization:
     output_format: List[str]
     theme: str
@@ -55,7 +60,7 @@ class Visualization:
     height: int
 
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     pkd_level: str = "division"
     pkd_year: int = 2007
@@ -1,10 +1,13 @@
-from dataclasses import dataclass
-from typing import Optional
-from datetime import datetime
-import pandas as pd
+from dataclasses import dataclass, fields
+from typing import TYPE_CHECKING
 
+import numpy as np
 
-@dataclass
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(slots=True)
 class SectorData:
     pkd_code: str
     year: int
@@ -16,23 +19,37 @@ class SectorData:
     num_companies: int
     
     @classmethod
-    def from_dataframe(cls, df: pd.DataFrame) -> list["SectorData"]:
-        return [
-            cls(
-                pkd_code=row["pkd_code"],
-                year=row["year"],
-                revenue=row["revenue"],
-                profit=row["profit"],
-                assets=row["assets"],
-                debt=row["debt"],
-                bankruptcies=row["bankruptcies"],
-                num_companies=row["num_companies"],
-            )
-            for _, row in df.iterrows()
+    def from_dataframe(cls, df: "pd.DataFrame") -> list["SectorData"]:
+        columns = [
+            df[name].to_numpy().tolist()
+            for name in ("pkd_code", "year", "revenue", "profit", "assets", "debt", "bankruptcies", "num_companies")
         ]
+        return [cls(*values) for values in zip(*columns)]
+
+
+@dataclass(slots=True)
+class SectorDataBatch:
+    pkd_code: np.ndarray
+    year: np.ndarray
+    revenue: np.ndarray
+    profit: np.ndarray
+    assets: np.ndarray
+    debt: np.ndarray
+    bankruptcies: np.ndarray
+    num_companies: np.ndarray
+    
+    @classmethod
+    def from_dataframe(cls, df: "pd.DataFrame") -> "SectorDataBatch":
+        return cls(**{field.name: df[field.name].to_numpy() for field in fields(cls)})
+    
+    def __len__(self) -> int:
+        return len(self.year)
+    
+    def __getitem__(self, index: int) -> SectorData:
+        return SectorData(*(getattr(self, field.name)[index] for field in fields(self)))
 
 
-@dataclass
+@dataclass(slots=True)
 class SectorIndicators:
     pkd_code: str
     size_score: float
@@ -66,7 +83,7 @@ class SectorIndicators:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SectorClassification:
     pkd_code: str
     branch_name: str
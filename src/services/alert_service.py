@@ -1,5 +1,6 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
 from src.utils.logger import get_logger
@@ -8,6 +9,17 @@ logger = get_logger(__name__)
 
 
 class AlertService:
+    _CATEGORY_ORDER = {
+        category: position
+        for position, category in enumerate([
+            'Bardzo dobra kondycja',
+            'Dobra kondycja',
+            'Średnia kondycja',
+            'Słaba kondycja',
+            'Bardzo słaba kondycja'
+        ])
+    }
+    
     def __init__(self):
         self.alert_thresholds = {
             'index_change': 0.1,
@@ -15,89 +27,82 @@ class AlertService:
             'risk_change': 0.2
         }
     
-    def check_index_change(self, current_sector: Dict, previous_sector: Optional[Dict]) -> Optional[Dict]:
+    @staticmethod
+    def _score_pair(current_sector: Dict, previous_sector: Optional[Dict], field: str) -> Optional[Tuple[float, float]]:
         if not previous_sector:
             return None
         
-        try:
-            current_index = current_sector.get('final_index', 0)
-            previous_index = previous_sector.get('final_index', 0)
-            
-            if previous_index == 0:
-                return None
-            
-            change = (current_index - previous_index) / previous_index
-            threshold = self.alert_thresholds['index_change']
-            
-            if abs(change) >= threshold:
-                return {
-                    'type': 'index_change',
-                    'severity': 'high' if abs(change) >= threshold * 2 else 'medium',
-                    'message': f"Znaczna zmiana indeksu: {change*100:.1f}%",
-                    'change': change,
-                    'current': current_index,
-                    'previous': previous_index
-                }
-            
+        current = current_sector.get(field, 0)
+        previous = previous_sector.get(field, 0)
+        if current is None or previous is None:
             return None
-        except Exception as e:
-            logger.warning(f"Błąd sprawdzania zmiany indeksu: {e}")
+        return current, previous
+    
+    def check_index_change(self, current_sector: Dict, previous_sector: Optional[Dict]) -> Optional[Dict]:
+        pair = self._score_pair(current_sector, previous_sector, 'final_index')
+        if pair is None or pair[1] == 0:
             return None
+        
+        current_index, previous_index = pair
+        change = (current_index - previous_index) / previous_index
+        threshold = self.alert_thresholds['index_change']
+        
+        if abs(change) >= threshold:
+            return {
+                'type': 'index_change',
+                'severity': 'high' if abs(change) >= threshold * 2 else 'medium',
+                'message': f"Znaczna zmiana indeksu: {change*100:.1f}%",
+                'change': change,
+                'current': current_index,
+                'previous': previous_index
+            }
+        
+        return None
     
     def check_growth_change(self, current_sector: Dict, previous_sector: Optional[Dict]) -> Optional[Dict]:
-        if not previous_sector:
+        pair = self._score_pair(current_sector, previous_sector, 'growth_score')
+        if pair is None:
             return None
         
-        try:
-            current_growth = current_sector.get('growth_score', 0)
-            previous_growth = previous_sector.get('growth_score', 0)
-            
-            change = abs(current_growth - previous_growth)
-            threshold = self.alert_thresholds['growth_change']
-            
-            if change >= threshold:
-                direction = 'wzrost' if current_growth > previous_growth else 'spadek'
-                return {
-                    'type': 'growth_change',
-                    'severity': 'high' if change >= threshold * 2 else 'medium',
-                    'message': f"Znaczna zmiana wskaźnika wzrostu: {direction} o {change*100:.1f}%",
-                    'change': current_growth - previous_growth,
-                    'current': current_growth,
-                    'previous': previous_growth
-                }
-            
-            return None
-        except Exception as e:
-            logger.warning(f"Błąd sprawdzania zmiany wzrostu: {e}")
-            return None
+        current_growth, previous_growth = pair
+        change = abs(current_growth - previous_growth)
+        threshold = self.alert_thresholds['growth_change']
+        
+        if change >= threshold:
+            direction = 'wzrost' if current_growth > previous_growth else 'spadek'
+            return {
+                'type': 'growth_change',
+                'severity': 'high' if change >= threshold * 2 else 'medium',
+                'message': f"Znaczna zmiana wskaźnika wzrostu: {direction} o {change*100:.1f}%",
+                'change': current_growth - previous_growth,
+                'current': current_growth,
+                'previous': previous_growth
+            }
+        
+        return None
     
     def check_risk_change(self, current_sector: Dict, previous_sector: Optional[Dict]) -> Optional[Dict]:
-        if not previous_sector:
+        pair = self._score_pair(current_sector, previous_sector, 'risk_score')
+        if pair is None:
             return None
         
-        try:
-            current_risk = current_sector.get('risk_score', 0)
-            previous_risk = previous_sector.get('risk_score', 0)
-            
-            change = abs(current_risk - previous_risk)
-            threshold = self.alert_thresholds['risk_change']
-            
-            if change >= threshold:
-                direction = 'wzrost' if current_risk > previous_risk else 'spadek'
-                severity = 'high' if current_risk > previous_risk else 'medium'
-                return {
-                    'type': 'risk_change',
-                    'severity': severity,
-                    'message': f"Znaczna zmiana ryzyka: {direction} o {change*100:.1f}%",
-                    'change': current_risk - previous_risk,
-                    'current': current_risk,
-                    'previous': previous_risk
-                }
-            
-            return None
-        except Exception as e:
-            logger.warning(f"Błąd sprawdzania zmiany ryzyka: {e}")
-            return None
+        current_risk, previous_risk = pair
+        change = abs(current_risk - previous_risk)
+        threshold = self.alert_thresholds['risk_change']
+        
+        if change >= threshold:
+            direction = 'wzrost' if current_risk > previous_risk else 'spadek'
+            severity = 'high' if current_risk > previous_risk else 'medium'
+            return {
+                'type': 'risk_change',
+                'severity': severity,
+                'message': f"Znaczna zmiana ryzyka: {direction} o {change*100:.1f}%",
+                'change': current_risk - previous_risk,
+                'current': current_risk,
+                'previous': previous_risk
+            }
+        
+        return None
     
     def check_all_alerts(self, current_sector: Dict, previous_sector: Optional[Dict]) -> List[Dict]:
         alerts = []
@@ -116,39 +121,84 @@ class AlertService:
         
         return alerts
     
+    def check_all_alerts_batch(self, current_df: pd.DataFrame, previous_df: pd.DataFrame) -> List[Dict]:
+        merged = current_df.merge(previous_df, on='pkd_code', how='inner', suffixes=('', '_prev'))
+        
+        def values(column: str) -> np.ndarray:
+            if column not in merged.columns:
+                return np.zeros(len(merged))
+            return merged[column].to_numpy(dtype=np.float64)
+        
+        pkd_codes = merged['pkd_code'].tolist()
+        found = []
+        
+        current_index = values('final_index')
+        previous_index = values('final_index_prev')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index_change = np.where(previous_index != 0, (current_index - previous_index) / previous_index, np.nan)
+        threshold = self.alert_thresholds['index_change']
+        for pos in np.flatnonzero(np.abs(index_change) >= threshold).tolist():
+            change = index_change[pos].item()
+            found.append((pos, 0, {
+                'type': 'index_change',
+                'severity': 'high' if abs(change) >= threshold * 2 else 'medium',
+                'message': f"Znaczna zmiana indeksu: {change*100:.1f}%",
+                'change': change,
+                'current': current_index[pos].item(),
+                'previous': previous_index[pos].item()
+            }))
+        
+        current_growth = values('growth_score')
+        previous_growth = values('growth_score_prev')
+        growth_change = np.abs(current_growth - previous_growth)
+        threshold = self.alert_thresholds['growth_change']
+        for pos in np.flatnonzero(growth_change >= threshold).tolist():
+            change = growth_change[pos].item()
+            direction = 'wzrost' if current_growth[pos] > previous_growth[pos] else 'spadek'
+            found.append((pos, 1, {
+                'type': 'growth_change',
+                'severity': 'high' if change >= threshold * 2 else 'medium',
+                'message': f"Znaczna zmiana wskaźnika wzrostu: {direction} o {change*100:.1f}%",
+                'change': (current_growth[pos] - previous_growth[pos]).item(),
+                'current': current_growth[pos].item(),
+                'previous': previous_growth[pos].item()
+            }))
+        
+        current_risk = values('risk_score')
+        previous_risk = values('risk_score_prev')
+        risk_change = np.abs(current_risk - previous_risk)
+        for pos in np.flatnonzero(risk_change >= self.alert_thresholds['risk_change']).tolist():
+            rising = current_risk[pos] > previous_risk[pos]
+            found.append((pos, 2, {
+                'type': 'risk_change',
+                'severity': 'high' if rising else 'medium',
+                'message': f"Znaczna zmiana ryzyka: {'wzrost' if rising else 'spadek'} o {risk_change[pos]*100:.1f}%",
+                'change': (current_risk[pos] - previous_risk[pos]).item(),
+                'current': current_risk[pos].item(),
+                'previous': previous_risk[pos].item()
+            }))
+        
+        found.sort(key=lambda item: item[:2])
+        return [{'pkd_code': pkd_codes[pos], **alert} for pos, _, alert in found]
+    
     def check_category_change(self, current_sector: Dict, previous_sector: Optional[Dict]) -> Optional[Dict]:
         if not previous_sector:
             return None
         
-        try:
-            current_category = current_sector.get('category')
-            previous_category = previous_sector.get('category')
-            
-            if current_category != previous_category:
-                category_order = [
-                    'Bardzo dobra kondycja',
-                    'Dobra kondycja',
-                    'Średnia kondycja',
-                    'Słaba kondycja',
-                    'Bardzo słaba kondycja'
-                ]
-                
-                current_idx = category_order.index(current_category) if current_category in category_order else 2
-                previous_idx = category_order.index(previous_category) if previous_category in category_order else 2
-                
-                improvement = current_idx < previous_idx
-                
-                return {
-                    'type': 'category_change',
-                    'severity': 'high',
-                    'message': f"Zmiana kategorii: {previous_category} → {current_category}",
-                    'improvement': improvement,
-                    'current': current_category,
-                    'previous': previous_category
-                }
-            
-            return None
-        except Exception as e:
-            logger.warning(f"Błąd sprawdzania zmiany kategorii: {e}")
+        current_category = current_sector.get('category')
+        previous_category = previous_sector.get('category')
+        
+        if current_category == previous_category:
             return None
-
+        
+        current_idx = self._CATEGORY_ORDER.get(current_category, 2)
+        previous_idx = self._CATEGORY_ORDER.get(previous_category, 2)
+        
+        return {
+            'type': 'category_change',
+            'severity': 'high',
+            'message': f"Zmiana kategorii: {previous_category} → {current_category}",
+            'improvement': current_idx < previous_idx,
+            'current': current_category,
+            'previous': previous_category
+        }
@@ -1,11 +1,12 @@
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 
 from src.models.config import Config
 from src.models.sector import SectorIndicators, SectorClassification
 from src.analysis.indicators import IndicatorCalculator
 from src.analysis.classifier import SectorClassifier
-from src.utils.pkd_mapping import get_pkd_division_name
+from src.utils.pkd_mapping import PKD_DIVISIONS_2007, UNKNOWN_DIVISION
 from src.utils.exceptions import CalculationError
 from src.utils.logger import get_logger
 
@@ -46,24 +47,30 @@ class AnalysisService:
     def prepare_final_results(self, indicators_df: pd.DataFrame) -> pd.DataFrame:
         logger.info("Przygotowywanie wyników końcowych")
         
-        indicators_df = indicators_df.copy()
-        
-        indicators_df['branch_name'] = indicators_df['pkd_code'].apply(get_pkd_division_name)
-        indicators_df = indicators_df.sort_values('final_index', ascending=False)
-        indicators_df['rank'] = range(1, len(indicators_df) + 1)
-        
         column_order = [
             'rank', 'pkd_code', 'branch_name', 'final_index', 'category',
             'size_score', 'growth_score', 'profitability_score', 'debt_score', 'risk_score',
             'revenue_growth_yoy', 'profit_growth_yoy', 'profit_margin',
             'debt_to_assets', 'bankruptcy_rate', 'num_companies'
         ]
+        source_columns = [
+            col for col in column_order
+            if col in indicators_df.columns and col not in ('rank', 'branch_name')
+        ]
+        
+        order = np.argsort(-indicators_df['final_index'].to_numpy(dtype=np.float64), kind='stable')
+        indicators_df = indicators_df.iloc[order, indicators_df.columns.get_indexer(source_columns)]
         
-        available_columns = [col for col in column_order if col in indicators_df.columns]
-        indicators_df = indicators_df[available_columns]
+        indicators_df.insert(0, 'rank', np.arange(1, len(indicators_df) + 1, dtype=np.int32))
+        indicators_df.insert(
+            indicators_df.columns.get_loc('pkd_code') + 1,
+            'branch_name',
+            indicators_df['pkd_code'].map(PKD_DIVISIONS_2007).fillna(UNKNOWN_DIVISION)
+        )
         
         logger.info(f"Wyniki końcowe przygotowane dla {len(indicators_df)} sektorów")
-        logger.info(f"Rozkład kategorii: {indicators_df['category'].value_counts().to_dict()}")
+        category_counts = indicators_df['category'].value_counts()
+        logger.info(f"Rozkład kategorii: {category_counts[category_counts > 0].to_dict()}")
         return indicators_df
     
     def get_top_sectors(self, results_df: pd.DataFrame, n: int = 10) -> pd.DataFrame:
@@ -11,23 +11,28 @@ class AnalyticsService:
     def __init__(self):
         pass
     
-    def calculate_correlations(self, sectors_df: pd.DataFrame) -> Dict[str, float]:
+    def calculate_correlations(self, sectors_df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> Dict[str, float]:
         try:
-            numeric_cols = sectors_df.select_dtypes(include=[np.number]).columns
-            correlations = {}
+            if numeric_df is None:
+                numeric_df = sectors_df.select_dtypes(include=[np.number])
             
-            if 'final_index' in numeric_cols:
-                for col in numeric_cols:
-                    if col != 'final_index':
-                        corr = sectors_df['final_index'].corr(sectors_df[col])
-                        if not pd.isna(corr):
-                            correlations[col] = float(corr)
+            if 'final_index' not in numeric_df.columns:
+                return {}
             
-            return correlations
+            others = numeric_df.drop(columns='final_index')
+            correlations = others.corrwith(numeric_df['final_index']).dropna()
+            return {col: float(corr) for col, corr in correlations.items()}
         except Exception as e:
             logger.error(f"Błąd obliczania korelacji: {e}")
             return {}
     
+    def calculate_overview(self, sectors_df: pd.DataFrame) -> Dict:
+        numeric_df = sectors_df.select_dtypes(include=[np.number])
+        return {
+            "correlations": self.calculate_correlations(sectors_df, numeric_df),
+            "statistics": self.calculate_statistics(sectors_df, numeric_df)
+        }
+    
     def find_correlated_sectors(self, sector1: Dict, sector2: Dict) -> float:
         try:
             metrics = [
@@ -116,24 +121,17 @@ class AnalyticsService:
             logger.error(f"Błąd klasteryzacji: {e}")
             return sectors_df
     
-    def calculate_statistics(self, sectors_df: pd.DataFrame) -> Dict:
+    def calculate_statistics(self, sectors_df: pd.DataFrame, numeric_df: Optional[pd.DataFrame] = None) -> Dict:
         try:
-            stats = {}
-            
-            numeric_cols = sectors_df.select_dtypes(include=[np.number]).columns
+            if numeric_df is None:
+                numeric_df = sectors_df.select_dtypes(include=[np.number])
             
-            for col in numeric_cols:
-                if col in sectors_df.columns:
-                    stats[col] = {
-                        'mean': float(sectors_df[col].mean()),
-                        'median': float(sectors_df[col].median()),
-                        'std': float(sectors_df[col].std()),
-                        'min': float(sectors_df[col].min()),
-                        'max': float(sectors_df[col].max())
-                    }
+            summary = numeric_df.agg(['mean', 'median', 'std', 'min', 'max']).astype(float)
+            stats = summary.to_dict()
             
             if 'category' in sectors_df.columns:
-                stats['category_distribution'] = sectors_df['category'].value_counts().to_dict()
+                category_counts = sectors_df['category'].value_counts()
+                stats['category_distribution'] = category_counts[category_counts > 0].to_dict()
             
             return stats
         except Exception as e:
@@ -1,4 +1,4 @@
-from typing import Dict, Optional, Any
+from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 import json
 from pathlib import Path
@@ -72,6 +72,18 @@ class CacheService:
         except Exception as e:
             logger.warning(f"Błąd zapisu cache: {e}")
     
+    def get_many(self, prefix: str, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        for key in dict.fromkeys(keys):
+            data = self.get(prefix, key)
+            if data is not None:
+                found[key] = data
+        return found
+    
+    def set_many(self, prefix: str, items: Dict[str, Any], ttl: Optional[timedelta] = None) -> None:
+        for key, data in items.items():
+            self.set(prefix, key, data, ttl=ttl)
+    
     def delete(self, prefix: str, key: str) -> None:
         cache_key = self._get_cache_key(prefix, key)
         
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import Optional, Dict, List
 import pandas as pd
 import datetime
+import codecs
 import io
 
 from src.models.config import Config
@@ -39,7 +40,7 @@ class ExportService:
                     )
             
             logger.info(f"Eksportowanie do CSV: {filepath}")
-            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            self._write_csv(df, filepath)
             logger.info(f"Pomyślnie wyeksportowano CSV: {filepath}")
             return filepath
         except PermissionError as e:
@@ -54,6 +55,54 @@ class ExportService:
             logger.error(error_msg)
             raise DataProcessingError(error_msg) from e
     
+    @staticmethod
+    def _write_csv(df: pd.DataFrame, filepath: Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.csv as pa_csv
+        except ImportError:
+            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            return
+        
+        # pyarrow formats timestamps differently from pandas and rejects mixed-type
+        # object columns, so such frames keep the pandas writer.
+        if not df.select_dtypes(include=['datetime', 'datetimetz']).columns.empty:
+            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            return
+        
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df.to_csv(filepath, index=False, encoding='utf-8-sig')
+            return
+        
+        with open(filepath, 'wb') as f:
+            f.write(codecs.BOM_UTF8)
+            pa_csv.write_csv(table, f)
+    
+    def export_to_parquet(
+        self,
+        df: pd.DataFrame,
+        filename: str = "indeks_branz.parquet"
+    ) -> Optional[Path]:
+        try:
+            import pyarrow
+        except ImportError:
+            logger.warning("pyarrow niedostępny, pomijam eksport do Parquet")
+            return None
+        
+        filepath = self.output_dir / filename
+        
+        try:
+            logger.info(f"Eksportowanie do Parquet: {filepath}")
+            df.to_parquet(filepath, engine="pyarrow", index=False)
+            logger.info(f"Pomyślnie wyeksportowano Parquet: {filepath}")
+            return filepath
+        except Exception as e:
+            error_msg = f"Błąd eksportowania do Parquet: {e}"
+            logger.error(error_msg)
+            raise DataProcessingError(error_msg) from e
+    
     def export_to_excel(
         self, 
         df: pd.DataFrame,
@@ -66,9 +115,8 @@ class ExportService:
         try:
             if filepath.exists():
                 try:
-                    import openpyxl
-                    wb = openpyxl.load_workbook(filepath)
-                    wb.close()
+                    with open(filepath, 'ab'):
+                        pass
                 except PermissionError:
                     timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
                     backup_filename = f"{filepath.stem}_{timestamp}{filepath.suffix}"
@@ -81,7 +129,7 @@ class ExportService:
             
             logger.info(f"Eksportowanie do Excel: {filepath}")
             
-            with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+            with pd.ExcelWriter(filepath, engine=self._excel_engine()) as writer:
                 df.to_excel(writer, sheet_name=main_sheet_name, index=False)
                 
                 if additional_sheets:
@@ -103,6 +151,26 @@ class ExportService:
             logger.error(error_msg)
             raise DataProcessingError(error_msg) from e
     
+    def export_to_excel_bytes(self, df: pd.DataFrame, main_sheet_name: str = "Indeks Branż") -> bytes:
+        try:
+            buffer = io.BytesIO()
+            with pd.ExcelWriter(buffer, engine=self._excel_engine()) as writer:
+                df.to_excel(writer, sheet_name=main_sheet_name, index=False)
+            return buffer.getvalue()
+        except Exception as e:
+            error_msg = f"Błąd eksportowania do Excel: {e}"
+            logger.error(error_msg)
+            raise DataProcessingError(error_msg) from e
+    
+    @staticmethod
+    def _excel_engine() -> str:
+        try:
+            import xlsxwriter
+            return 'xlsxwriter'
+        except ImportError:
+            logger.warning("xlsxwriter nie jest zainstalowany, używam wolniejszego silnika openpyxl")
+            return 'openpyxl'
+    
     def export_results(
         self,
         results_df: pd.DataFrame,
@@ -113,6 +181,7 @@ class ExportService:
         logger.info("Eksportowanie wszystkich wyników")
         
         csv_path = self.export_to_csv(results_df)
+        parquet_path = self.export_to_parquet(results_df)
         
         additional_sheets = {}
         if top_10_df is not None:
@@ -129,6 +198,7 @@ class ExportService:
         
         return {
             "csv": csv_path,
+            "parquet": parquet_path,
             "excel": excel_path
         }
     
@@ -1,4 +1,5 @@
 from typing import Dict, Optional, List
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from datetime import datetime
 
@@ -32,7 +33,11 @@ class IntegrationService:
         try:
             indicators = {}
             
-            eur_rate = self.get_nbp_exchange_rates("EUR", 1)
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                eur_future = executor.submit(self.get_nbp_exchange_rates, "EUR", 1)
+                usd_future = executor.submit(self.get_nbp_exchange_rates, "USD", 1)
+                eur_rate, usd_rate = eur_future.result(), usd_future.result()
+            
             if eur_rate and eur_rate.get("rates"):
                 latest_rate = eur_rate["rates"][-1]
                 indicators["eur_rate"] = {
@@ -41,7 +46,6 @@ class IntegrationService:
                     "source": "NBP"
                 }
             
-            usd_rate = self.get_nbp_exchange_rates("USD", 1)
             if usd_rate and usd_rate.get("rates"):
                 latest_rate = usd_rate["rates"][-1]
                 indicators["usd_rate"] = {
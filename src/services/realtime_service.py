@@ -1,5 +1,7 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 
 from src.utils.logger import get_logger
@@ -8,10 +10,14 @@ logger = get_logger(__name__)
 
 
 class RealtimeDataService:
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, max_workers: int = 5):
         self.bdl_base_url = "https://bdl.stat.gov.pl/api/v1"
         self.api_key = api_key
+        self.max_workers = max_workers
         self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
         
         if self.api_key:
             self.session.headers.update({"X-ClientId": self.api_key})
@@ -153,42 +159,60 @@ class RealtimeDataService:
     def search_subjects_by_keyword(self, keyword: str) -> List[Dict]:
         return self.get_subjects(search=keyword)
     
+    def _map_subjects(self, fetch, subject_names: List[str]) -> List:
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(subject_names))) as executor:
+            return list(executor.map(fetch, subject_names))
+    
+    def _get_popular_subject(self, subject_name: str, unit_level: int) -> Optional[Dict]:
+        subjects = self.search_subjects_by_keyword(subject_name)
+        if not subjects:
+            return None
+        
+        subject = subjects[0]
+        subject_id = subject.get("id") or subject.get("Id")
+        if not subject_id:
+            return None
+        
+        variables = self.get_variables(subject_id=subject_id)
+        if not variables:
+            return None
+        
+        var = variables[0]
+        var_id = var.get("id") or var.get("Id")
+        if not var_id:
+            return None
+        
+        try:
+            data = self.get_data_by_variable(
+                str(var_id),
+                unit_level=unit_level,
+                page_size=20
+            )
+            return {
+                "subject": subject,
+                "variable": var,
+                "data": data
+            }
+        except Exception as e:
+            logger.warning(f"Nie udało się pobrać danych dla {subject_name}: {e}")
+            return {
+                "subject": subject,
+                "variable": var,
+                "error": str(e)
+            }
+    
     def get_popular_statistics(self, unit_level: int = 2) -> Dict:
         try:
             popular_subjects = ["Ludność", "Gospodarka", "Przemysł", "Handel", "Bezrobocie"]
-            results = {}
-            
-            for subject_name in popular_subjects:
-                subjects = self.search_subjects_by_keyword(subject_name)
-                if subjects:
-                    subject = subjects[0]
-                    subject_id = subject.get("id") or subject.get("Id")
-                    
-                    if subject_id:
-                        variables = self.get_variables(subject_id=subject_id)
-                        if variables:
-                            var = variables[0]
-                            var_id = var.get("id") or var.get("Id")
-                            
-                            if var_id:
-                                try:
-                                    data = self.get_data_by_variable(
-                                        str(var_id),
-                                        unit_level=unit_level,
-                                        page_size=20
-                                    )
-                                    results[subject_name] = {
-                                        "subject": subject,
-                                        "variable": var,
-                                        "data": data
-                                    }
-                                except Exception as e:
-                                    logger.warning(f"Nie udało się pobrać danych dla {subject_name}: {e}")
-                                    results[subject_name] = {
-                                        "subject": subject,
-                                        "variable": var,
-                                        "error": str(e)
-                                    }
+            fetched = self._map_subjects(
+                lambda subject_name: self._get_popular_subject(subject_name, unit_level),
+                popular_subjects
+            )
+            results = {
+                subject_name: entry
+                for subject_name, entry in zip(popular_subjects, fetched)
+                if entry is not None
+            }
             
             return {
                 "timestamp": datetime.now().isoformat(),
@@ -199,60 +223,73 @@ class RealtimeDataService:
             logger.error(f"Błąd pobierania popularnych statystyk: {e}")
             raise Exception(f"Błąd pobierania popularnych statystyk: {str(e)}")
     
+    def _get_subject_metric(self, subject_name: str, unit_level: int,
+                            years: Optional[List[int]]) -> Optional[Tuple[str, Dict]]:
+        subjects = self.search_subjects_by_keyword(subject_name)
+        if not subjects:
+            return None
+        
+        subject = subjects[0]
+        subject_id = subject.get("id") or subject.get("Id")
+        if not subject_id:
+            return None
+        
+        variables = self.get_variables(subject_id=subject_id, years=years)
+        if not variables:
+            return None
+        
+        var = variables[0]
+        var_id = var.get("id") or var.get("Id")
+        var_name = var.get("name") or var.get("Name", subject_name)
+        if not var_id:
+            return None
+        
+        try:
+            data = self.get_data_by_variable(
+                str(var_id),
+                unit_level=unit_level,
+                years=years,
+                page_size=50
+            )
+            
+            results = data.get("results") or data.get("data") or []
+            if not isinstance(results, list) or len(results) == 0:
+                return None
+            
+            total_value = 0
+            count = 0
+            for item in results:
+                values = item.get("values") or item.get("Values") or []
+                if isinstance(values, list):
+                    for v in values:
+                        val = v.get("value") or v.get("Value")
+                        if val is not None:
+                            try:
+                                total_value += float(val)
+                                count += 1
+                            except (ValueError, TypeError):
+                                pass
+            
+            if count > 0:
+                return var_name, {
+                    "value": total_value / count,
+                    "count": count,
+                    "variable_id": var_id
+                }
+        except Exception as e:
+            logger.warning(f"Nie udało się pobrać danych dla {subject_name}: {e}")
+        return None
+    
     def get_sector_data_from_bdl(self, pkd_code: str, unit_level: int = 2, years: Optional[List[int]] = None) -> Dict:
         try:
             logger.info(f"Pobieranie danych BDL dla PKD {pkd_code}")
             
             economic_subjects = ["Gospodarka", "Przemysł", "Handel", "Usługi", "Ludność"]
-            metrics = {}
-            
-            for subject_name in economic_subjects:
-                subjects = self.search_subjects_by_keyword(subject_name)
-                if subjects:
-                    subject = subjects[0]
-                    subject_id = subject.get("id") or subject.get("Id")
-                    
-                    if subject_id:
-                        variables = self.get_variables(subject_id=subject_id, years=years)
-                        if variables:
-                            var = variables[0]
-                            var_id = var.get("id") or var.get("Id")
-                            var_name = var.get("name") or var.get("Name", subject_name)
-                            
-                            if var_id:
-                                try:
-                                    data = self.get_data_by_variable(
-                                        str(var_id),
-                                        unit_level=unit_level,
-                                        years=years,
-                                        page_size=50
-                                    )
-                                    
-                                    results = data.get("results") or data.get("data") or []
-                                    if isinstance(results, list) and len(results) > 0:
-                                        total_value = 0
-                                        count = 0
-                                        for item in results:
-                                            values = item.get("values") or item.get("Values") or []
-                                            if isinstance(values, list):
-                                                for v in values:
-                                                    val = v.get("value") or v.get("Value")
-                                                    if val is not None:
-                                                        try:
-                                                            total_value += float(val)
-                                                            count += 1
-                                                        except (ValueError, TypeError):
-                                                            pass
-                                        
-                                        if count > 0:
-                                            avg_value = total_value / count
-                                            metrics[var_name] = {
-                                                "value": avg_value,
-                                                "count": count,
-                                                "variable_id": var_id
-                                            }
-                                except Exception as e:
-                                    logger.warning(f"Nie udało się pobrać danych dla {subject_name}: {e}")
+            fetched = self._map_subjects(
+                lambda subject_name: self._get_subject_metric(subject_name, unit_level, years),
+                economic_subjects
+            )
+            metrics = dict(metric for metric in fetched if metric is not None)
             
             return {
                 "pkd_code": pkd_code,
@@ -1,4 +1,6 @@
+import copy
 import yaml
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Dict, Any
 
@@ -9,22 +11,29 @@ from src.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str, mtime_ns: int) -> Config:
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_dict = yaml.safe_load(f)
+    
+    if not config_dict:
+        raise ConfigurationError("Configuration file is empty")
+    
+    config = Config.from_dict(config_dict)
+    
+    if not config.weights.validate():
+        logger.warning("Weights do not sum to 1.0, but continuing...")
+    return config
+
+
 def load_config(config_path: Optional[Path] = None) -> Config:
     if config_path is None:
         config_path = Path(__file__).parent.parent.parent / "config" / "config.yaml"
     
     try:
         logger.info(f"Loading configuration from {config_path}")
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_dict = yaml.safe_load(f)
-        
-        if not config_dict:
-            raise ConfigurationError("Configuration file is empty")
-        
-        config = Config.from_dict(config_dict)
-        
-        if not config.weights.validate():
-            logger.warning("Weights do not sum to 1.0, but continuing...")
+        config_path = Path(config_path)
+        config = copy.deepcopy(_load_config_cached(str(config_path), config_path.stat().st_mtime_ns))
         
         logger.info("Configuration loaded successfully")
         return config
@@ -4,6 +4,8 @@ PKD/NACE code mapping and sector definitions.
 
 from typing import Dict
 
+UNKNOWN_DIVISION = "Nieznany dział"
+
 PKD_DIVISIONS_2007: Dict[str, str] = {
     "01": "Uprawy rolne, chów i hodowla zwierząt, łowiectwo, włączając działalność usługową",
     "02": "Leśnictwo i pozyskiwanie drewna",
@@ -100,7 +102,7 @@ def get_pkd_division_name(code: str) -> str:
     Returns:
         Division name or "Unknown division" if code not found
     """
-    return PKD_DIVISIONS_2007.get(code, "Nieznany dział")
+    return PKD_DIVISIONS_2007.get(code, UNKNOWN_DIVISION)
 
 
 def get_all_divisions() -> Dict[str, str]:
@@ -7,7 +7,8 @@ import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 
 from src.models.config import Config
 from src.utils.exceptions import VisualizationError
@@ -140,6 +141,7 @@ class Visualizer:
     def create_category_distribution(self, indicators_df: pd.DataFrame) -> go.Figure:
         """Tworzy wykres rozkładu kategorii"""
         category_counts = indicators_df['category'].value_counts()
+        category_counts = category_counts[category_counts > 0]
         
         fig = go.Figure(data=[go.Pie(
             labels=category_counts.index,
@@ -212,4 +214,34 @@ class Visualizer:
             error_msg = f"Error saving visualization {filename}: {e}"
             logger.error(error_msg)
             raise VisualizationError(error_msg) from e
-
+    
+    def save_all(self, figures: Dict[str, go.Figure], format: str = 'html', max_workers: int = 4) -> List[Path]:
+        """
+        Save several figures, writing files concurrently.
+        
+        The first figure is written on the calling thread so that plotly
+        finishes its lazy serializer imports before worker threads start.
+        
+        Args:
+            figures: Mapping of output filename (without extension) to figure
+            format: Output format (html, png, pdf)
+            max_workers: Maximum number of writer threads
+            
+        Returns:
+            Paths to saved files, in mapping order
+            
+        Raises:
+            VisualizationError: If saving any figure fails
+        """
+        items = list(figures.items())
+        if not items:
+            return []
+        
+        first_name, first_fig = items[0]
+        paths = [self.save_figure(first_fig, first_name, format)]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(self.save_figure, fig, filename, format) for filename, fig in items[1:]]
+            paths.extend(future.result() for future in futures)
+        
+        return paths
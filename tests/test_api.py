@@ -0,0 +1,87 @@
+"""
+Unit tests for API conditional requests.
+"""
+
+import os
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+import src.api.main as api
+
+
+def write_results(path, final_index):
+    pd.DataFrame({
+        "rank": [1, 2],
+        "pkd_code": ["62", "10"],
+        "branch_name": ["Działalność związana z oprogramowaniem", "Produkcja artykułów spożywczych"],
+        "final_index": final_index,
+        "category": ["Dobra kondycja", "Średnia kondycja"],
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Serve results from a temporary CSV without running the startup hooks."""
+    results_path = tmp_path / "indeks_branz.csv"
+    write_results(results_path, [0.8, 0.5])
+    
+    monkeypatch.setattr(api, "RESULTS_CSV_PATH", results_path)
+    monkeypatch.setattr(api, "RESULTS_PARQUET_PATH", tmp_path / "indeks_branz.parquet")
+    monkeypatch.setattr(api, "RESULTS_CHECK_INTERVAL", 0.0)
+    monkeypatch.setattr(api, "results", None)
+    monkeypatch.setattr(api, "results_watched", False)
+    
+    return TestClient(api.app), results_path
+
+
+class TestConditionalRequests:
+    """Tests for ETag / Last-Modified handling on result endpoints."""
+    
+    def test_matching_etag_returns_304(self, client):
+        """Test that a repeated request with the returned ETag is not modified."""
+        client, _ = client
+        
+        first = client.get("/sectors")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert first.headers["last-modified"]
+        assert first.headers["cache-control"] == api.RESULTS_CACHE_CONTROL
+        
+        for if_none_match in (etag, f'"other", W/{etag}', "*"):
+            response = client.get("/sectors", headers={"If-None-Match": if_none_match})
+            assert response.status_code == 304
+            assert response.headers["etag"] == etag
+            assert response.content == b""
+        
+        response = client.get("/sectors", headers={"If-None-Match": '"other"'})
+        assert response.status_code == 200
+    
+    def test_changed_results_return_200(self, client):
+        """Test that a stale ETag gets a fresh response after the results file changes."""
+        client, results_path = client
+        
+        etag = client.get("/sectors").headers["etag"]
+        
+        write_results(results_path, [0.9, 0.4])
+        stat = results_path.stat()
+        os.utime(results_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        response = client.get("/sectors", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+        assert response.json()[0]["final_index"] == 0.9
+    
+    def test_if_modified_since(self, client):
+        """Test If-Modified-Since with a valid and a malformed date."""
+        client, _ = client
+        
+        last_modified = client.get("/sectors").headers["last-modified"]
+        
+        response = client.get("/sectors", headers={"If-Modified-Since": last_modified})
+        assert response.status_code == 304
+        
+        response = client.get("/sectors", headers={"If-Modified-Since": "not a date"})
+        assert response.status_code == 200
+        assert len(response.json()) == 2
@@ -0,0 +1,25 @@
+"""
+Unit tests for data collection.
+"""
+
+import pandas as pd
+
+from src.data_collection.sample_data_generator import SampleDataGenerator
+
+
+class TestSampleDataGenerator:
+    """Tests for SampleDataGenerator."""
+    
+    def test_generate_all_sectors_is_reproducible(self):
+        """Test that the same seed gives identical frames regardless of worker count."""
+        pkd_codes = ["10", "62", "99"]
+        years = [2022, 2023, 2024]
+        
+        first = SampleDataGenerator(seed=7).generate_all_sectors(pkd_codes, years, max_workers=2)
+        second = SampleDataGenerator(seed=7).generate_all_sectors(pkd_codes, years, max_workers=2)
+        single = SampleDataGenerator(seed=7).generate_all_sectors(pkd_codes, years, max_workers=1)
+        
+        assert len(first) == len(pkd_codes) * len(years)
+        assert first["pkd_code"].tolist() == [code for code in pkd_codes for _ in years]
+        pd.testing.assert_frame_equal(first, second)
+        pd.testing.assert_frame_equal(first, single)
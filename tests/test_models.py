@@ -4,7 +4,7 @@ Unit tests for models.
 
 import pytest
 from src.models.config import Weights, Config, Category, Classification
-from src.models.sector import SectorData
+from src.models.sector import SectorData, SectorDataBatch
 import pandas as pd
 
 
@@ -83,4 +83,22 @@ class TestSectorData:
         assert len(sectors) == 2
         assert sectors[0].pkd_code == "62"
         assert sectors[1].year == 2024
+    
+    def test_sector_data_batch_from_dataframe(self):
+        """Test creating a column-oriented SectorDataBatch from DataFrame."""
+        df = pd.DataFrame({
+            "pkd_code": ["62", "62"],
+            "year": [2023, 2024],
+            "revenue": [900000.0, 1000000.0],
+            "profit": [135000.0, 150000.0],
+            "assets": [1800000.0, 2000000.0],
+            "debt": [450000.0, 500000.0],
+            "bankruptcies": [8, 10],
+            "num_companies": [950, 1000]
+        })
+        
+        batch = SectorDataBatch.from_dataframe(df)
+        assert len(batch) == 2
+        assert (batch.profit / batch.revenue).tolist() == [0.15, 0.15]
+        assert batch[1] == SectorData.from_dataframe(df)[1]
 
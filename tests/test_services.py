@@ -10,6 +10,8 @@ from src.models.config import Config, Weights, AnalysisPeriod, DataSources, Data
 from src.services.data_service import DataService
 from src.services.analysis_service import AnalysisService
 from src.services.export_service import ExportService
+from src.services.cache_service import CacheService
+from src.services.alert_service import AlertService
 
 
 @pytest.fixture
@@ -91,6 +93,15 @@ class TestExportService:
         loaded = pd.read_csv(filepath)
         assert len(loaded) == len(sample_sector_data)
     
+    def test_export_to_csv_mixed_object_column(self, tmp_path):
+        service = ExportService(Config(), tmp_path)
+        for name, df in {
+            "mixed.csv": pd.DataFrame({"value": ["x", 1, 2.5]}),
+            "dates.csv": pd.DataFrame({"date": pd.to_datetime(["2024-01-01", "2024-01-02"])}),
+        }.items():
+            filepath = service.export_to_csv(df, name)
+            assert filepath.read_text(encoding="utf-8-sig") == df.to_csv(index=False)
+    
     def test_export_to_excel(self, sample_config, sample_sector_data, tmp_path):
         service = ExportService(sample_config, tmp_path)
         filepath = service.export_to_excel(sample_sector_data, "test.xlsx")
@@ -101,3 +112,46 @@ class TestExportService:
         loaded = pd.read_excel(filepath)
         assert len(loaded) == len(sample_sector_data)
 
+
+class TestCacheService:
+    
+    def test_get_many_returns_only_hits(self, tmp_path):
+        service = CacheService(tmp_path)
+        service.set_many("sector", {"10": {"final_index": 0.5}, "62": {"final_index": 0.7}})
+        
+        found = service.get_many("sector", ["10", "62", "99"])
+        assert found == {"10": {"final_index": 0.5}, "62": {"final_index": 0.7}}
+        
+        service.memory_cache.clear()
+        assert service.get_many("sector", ["62"]) == {"62": {"final_index": 0.7}}
+
+
+class TestAlertService:
+    
+    def test_batch_alerts_match_per_sector_checks(self):
+        current = pd.DataFrame({
+            "pkd_code": ["10", "20", "46", "62", "86"],
+            "final_index": [0.80, 0.50, float("nan"), 0.40, 0.30],
+            "growth_score": [0.90, 0.50, 0.20, 0.40, 0.30],
+            "risk_score": [0.20, 0.90, 0.50, 0.40, 0.30],
+            "category": ["Dobra kondycja", "Średnia kondycja", "Słaba kondycja", "Średnia kondycja", "Słaba kondycja"],
+        })
+        previous = pd.DataFrame({
+            "pkd_code": ["10", "20", "46", "62"],
+            "final_index": [0.50, 0.0, 0.30, 0.41],
+            "growth_score": [0.50, 0.45, float("nan"), 0.40],
+            "risk_score": [0.60, 0.50, 0.50, 0.40],
+            "category": ["Średnia kondycja", "Średnia kondycja", "Dobra kondycja", "Średnia kondycja"],
+        })
+        service = AlertService()
+        
+        previous_by_code = {record["pkd_code"]: record for record in previous.to_dict("records")}
+        expected = [
+            {"pkd_code": record["pkd_code"], **alert}
+            for record in current.to_dict("records")
+            for alert in service.check_all_alerts(record, previous_by_code.get(record["pkd_code"]))
+        ]
+        
+        assert expected
+        assert service.check_all_alerts_batch(current, previous) == expected
+